@@ -5,18 +5,17 @@ Assembles all components into the complete editor interface.
 
 import os
 import tkinter as tk
+from collections import deque
 from tkinter import ttk, filedialog, messagebox
 
 from editor.tab_manager import TabManager
-from panels.find_replace import FindReplaceDialog
 from panels.workspace import WorkspacePanel
 from panels.bottom_panel import BottomPanel
-from panels.settings_dialog import SettingsDialog
 from linting.linter import Linter
 from utils.language_detect import SUPPORTED_LANGUAGES
 from utils.language_detect import SUPPORTED_LANGUAGES
 from utils.file_utils import get_recent_files
-from utils.settings import SettingsManager
+from utils.settings import get_settings_manager
 
 
 class NP2App:
@@ -41,7 +40,7 @@ class NP2App:
         self.show_terminal = True
         
         # Initialize settings
-        self.settings_manager = SettingsManager()
+        self.settings_manager = get_settings_manager()
         self.settings = self.settings_manager.settings
 
         # Setup
@@ -56,7 +55,8 @@ class NP2App:
         self._apply_settings()
         
         # Initialize dialogs
-        self.find_dialog = FindReplaceDialog(self.root, None)
+        # Created on first Find/Replace (see _get_find_dialog)
+        self.find_dialog = None
         
         # Load session or create initial tab
         if not self._load_session():
@@ -227,8 +227,11 @@ class NP2App:
         self.bottom_panel = BottomPanel(self.right_pane, on_problem_click=self._on_goto_line)
         self.right_pane.add(self.bottom_panel, weight=1)
         
-        # Initialize linter
+        # Initialize linter; its worker thread hands results over through
+        # a one-slot deque (append is atomic) and a <<LintResults>> event
+        self._lint_results = deque(maxlen=1)
         self.linter = Linter(on_results=self._on_lint_results)
+        self.bottom_panel.bind('<<LintResults>>', self._drain_lint_results)
         
         # Bind tab change event
         self.tab_manager.bind('<<NotebookTabChanged>>', self._on_tab_changed)
@@ -398,15 +401,24 @@ class NP2App:
         """Show find dialog."""
         editor = self.tab_manager.get_current_editor()
         if editor:
-            self.find_dialog.editor = editor
-            self.find_dialog.show(replace_mode=False)
+            find_dialog = self._get_find_dialog()
+            find_dialog.editor = editor
+            find_dialog.show(replace_mode=False)
+    
+    def _get_find_dialog(self):
+        """Get the find dialog, importing and creating it on first use."""
+        if self.find_dialog is None:
+            from panels.find_replace import FindReplaceDialog
+            self.find_dialog = FindReplaceDialog(self.root, None)
+        return self.find_dialog
     
     def _replace(self):
         """Show replace dialog."""
         editor = self.tab_manager.get_current_editor()
         if editor:
-            self.find_dialog.editor = editor
-            self.find_dialog.show(replace_mode=True)
+            find_dialog = self._get_find_dialog()
+            find_dialog.editor = editor
+            find_dialog.show(replace_mode=True)
     
     def _goto_line(self):
         """Show go to line dialog."""
@@ -507,8 +519,7 @@ class NP2App:
         """Set language for current editor."""
         editor = self.tab_manager.get_current_editor()
         if editor:
-            editor.set_language(language)
-            editor.highlighter.highlight_all()  # Re-apply highlighting
+            editor.set_language(language)  # Re-applies highlighting
             self.current_lang_var.set(language)  # Update menu checkmark
             self.status_lang.configure(text=language.title())
     
@@ -519,30 +530,19 @@ class NP2App:
         if not editor:
             return
         
-        # Use temp file for linting to avoid auto-saving user's file
+        # Lint the editor content, not the file on disk (no auto-save needed)
         if editor.filepath:
-            # Create temp dir if needed
-            temp_dir = os.path.join(os.path.expanduser('~'), '.np2', 'temp')
-            os.makedirs(temp_dir, exist_ok=True)
-            
-            # Create temp file with same extension as original (to help linter)
-            ext = os.path.splitext(editor.filepath)[1]
-            temp_filename = f"lint_temp_{os.path.basename(editor.filepath)}"
-            temp_path = os.path.join(temp_dir, temp_filename)
-            
             try:
-                # Write current content to temp file
-                with open(temp_path, 'w', encoding=editor.encoding) as f:
-                    f.write(editor.get_content())
-                
                 # Store ORIGINAL filepath for callback (so markers are applied to editor)
                 self._lint_filepath = editor.filepath
                 
-                # Run linter on temp file, but with ORIGINAL CWD (for imports)
-                self.linter.lint_file(
-                    temp_path, 
-                    editor.language, 
-                    cwd=os.path.dirname(editor.filepath)
+                # Lint with ORIGINAL CWD (for imports)
+                self.linter.lint_source(
+                    editor.get_content(),
+                    editor.filepath,
+                    editor.language,
+                    cwd=os.path.dirname(editor.filepath),
+                    encoding=editor.encoding,
                 )
                 
                 # Show feedback
@@ -555,7 +555,24 @@ class NP2App:
              pass
     
     def _on_lint_results(self, errors):
-        """Handle lint results callback."""
+        """Handle lint results callback (called on the linter worker thread)."""
+        # Tk is not thread-safe - only the newest result is kept for the main loop
+        self._lint_results.append(errors)
+        try:
+            self.bottom_panel.event_generate('<<LintResults>>', when='tail')
+        except (tk.TclError, RuntimeError):
+            pass  # Window destroyed or main loop gone
+    
+    def _drain_lint_results(self, event=None):
+        """Apply the newest queued lint result (runs on the Tk main thread)."""
+        try:
+            errors = self._lint_results.popleft()
+        except IndexError:
+            return
+        self._apply_lint_results(errors)
+    
+    def _apply_lint_results(self, errors):
+        """Show lint results in the problems panel and editor gutter."""
         filepath = getattr(self, '_lint_filepath', None)
         self.bottom_panel.show_lint_results(errors, filepath)
         
@@ -621,7 +638,8 @@ class NP2App:
         """Handle tab change."""
         editor = self.tab_manager.get_current_editor()
         if editor:
-            self.find_dialog.set_editor(editor)
+            if self.find_dialog:
+                self.find_dialog.set_editor(editor)
             self.current_lang_var.set(editor.language)  # Sync language menu
             self._update_status()
             
@@ -676,12 +694,17 @@ class NP2App:
         # Save session (persists drafts)
         self._save_session()
         
+        # Stop background linter processes
+        self.linter.shutdown()
+        
         # Directly destroy without prompting for individual tabs
         # Session persistence handles the data safety.
         self.root.destroy()
             
     def _show_preferences(self):
         """Show preferences dialog."""
+        # Imported on first open - most sessions never show it
+        from panels.settings_dialog import SettingsDialog
         dialog = SettingsDialog(self.root, self.settings_manager)
         self.root.wait_window(dialog)
         
@@ -3,15 +3,21 @@ Syntax highlighting engine for NP2 editor.
 Uses Pygments for language-specific highlighting.
 """
 
+from utils.language_detect import get_lexer_for_language
+
 try:
     from pygments import lex
-    from pygments.lexers import get_lexer_by_name, TextLexer
+    from pygments.lexers import TextLexer
     from pygments.token import Token
     PYGMENTS_AVAILABLE = True
 except ImportError:
     PYGMENTS_AVAILABLE = False
 
 
+# Lines highlighted per idle step when filling in the rest of a document
+HIGHLIGHT_CHUNK_LINES = 200
+
+
 # Color schemes - Modern VS Code inspired
 THEMES = {
     'dark': {
@@ -108,6 +114,8 @@ class SyntaxHighlighter:
         self.theme = THEMES.get(theme, THEMES['light'])
         self.lexer = TextLexer() if PYGMENTS_AVAILABLE else None
         self.language = 'text'
+        self._chunk_job = None
+        self._pending_chunks = None
         
         self._setup_tags()
     
@@ -144,10 +152,7 @@ class SyntaxHighlighter:
         if not PYGMENTS_AVAILABLE:
             return
         
-        try:
-            self.lexer = get_lexer_by_name(language)
-        except Exception:
-            self.lexer = TextLexer()
+        self.lexer = get_lexer_for_language(language) or TextLexer()
     
     def set_theme(self, theme_name):
         """
@@ -162,6 +167,8 @@ class SyntaxHighlighter:
     
     def highlight_all(self):
         """Highlight the entire document."""
+        self.cancel_pending()
+        
         if not PYGMENTS_AVAILABLE or not self.lexer:
             return
         
@@ -176,6 +183,78 @@ class SyntaxHighlighter:
         # Apply new highlighting
         self._apply_highlighting(content, '1.0')
     
+    def highlight_progressive(self, first_line, last_line, chunk_lines=HIGHLIGHT_CHUNK_LINES):
+        """
+        Highlight the visible lines now and the rest of the document when idle.
+        
+        Args:
+            first_line: First visible line number
+            last_line: Last visible line number
+            chunk_lines: Number of lines to highlight per idle step
+        """
+        self.cancel_pending()
+        
+        if not PYGMENTS_AVAILABLE or not self.lexer:
+            return
+        
+        # Remove old tags once for the whole document
+        for token_type in self.theme:
+            if not isinstance(token_type, str):
+                self.text_widget.tag_remove(str(token_type), '1.0', 'end')
+        
+        total_lines = int(self.text_widget.index('end-1c').split('.')[0])
+        first_line = max(1, first_line)
+        last_line = min(total_lines, last_line, first_line + chunk_lines - 1)
+        
+        # First paint: only the viewport
+        self._highlight_lines(first_line, last_line)
+        
+        # Queue the remainder (below the viewport first, then above it)
+        self._pending_chunks = self._iter_chunks(first_line, last_line, total_lines, chunk_lines)
+        self._chunk_job = self.text_widget.after_idle(self._highlight_next_chunk)
+    
+    def cancel_pending(self):
+        """Cancel any queued background highlighting."""
+        if self._chunk_job:
+            try:
+                self.text_widget.after_cancel(self._chunk_job)
+            except Exception:
+                pass
+        self._chunk_job = None
+        self._pending_chunks = None
+    
+    def _iter_chunks(self, first_line, last_line, total_lines, chunk_lines):
+        """Yield (start_line, end_line) ranges outside the already highlighted viewport."""
+        for start in range(last_line + 1, total_lines + 1, chunk_lines):
+            yield start, min(start + chunk_lines - 1, total_lines)
+        for start in range(1, first_line, chunk_lines):
+            yield start, min(start + chunk_lines - 1, first_line - 1)
+    
+    def _highlight_next_chunk(self):
+        """Highlight one queued chunk and reschedule until done."""
+        self._chunk_job = None
+        if self._pending_chunks is None:
+            return
+        
+        try:
+            start_line, end_line = next(self._pending_chunks)
+        except StopIteration:
+            self._pending_chunks = None
+            return
+        
+        try:
+            self._highlight_lines(start_line, end_line)
+        except Exception:
+            pass  # Widget may have been destroyed
+        
+        self._chunk_job = self.text_widget.after_idle(self._highlight_next_chunk)
+    
+    def _highlight_lines(self, start_line, end_line):
+        """Highlight whole lines without clearing existing tags."""
+        line_start = f'{start_line}.0'
+        content = self.text_widget.get(line_start, f'{end_line}.end')
+        self._apply_highlighting(content, line_start)
+    
     def highlight_region(self, start, end):
         """
         Highlight a specific region.
@@ -4,11 +4,110 @@ Rich text editor with line numbers, syntax highlighting, and more.
 """
 
 import os
+import re
+import sys
 import tkinter as tk
+from bisect import bisect_right
+from itertools import islice
 from tkinter import ttk
 from editor.syntax import SyntaxHighlighter
 from editor.autocomplete import AutoComplete
 from utils.language_detect import detect_language, SUPPORTED_LANGUAGES
+from utils.timers import CoalescingTimer
+
+# Interned Tk index strings reused on hot paths
+_IDX_START, _IDX_END, _IDX_INSERT, _IDX_OCC_TAG = map(
+    sys.intern, ('1.0', 'end', 'insert', 'occurrence'))
+
+_NEWLINE_RE = re.compile('\n')
+
+# Wraps a Text widget's Tcl command so every edit bumps ::np2_edits(<path>) -
+# whether it comes from Python, a class binding (typing, paste) or undo.
+# Pure Tcl: other widget calls pay no Python callback
+_EDIT_COUNTER_TCL = '''
+set ::np2_edits(WIDGET) 0
+rename WIDGET WIDGET.np2_text
+proc WIDGET {cmd args} {
+    if {$cmd in {insert delete replace}
+            || ($cmd eq "edit" && [lindex $args 0] in {undo redo})} {
+        incr ::np2_edits(WIDGET)
+    }
+    WIDGET.np2_text $cmd {*}$args
+}
+'''
+
+# Tk 8.6 stores characters outside the BMP as surrogate pairs, so each one
+# takes two index columns (Tcl 9 counts them once)
+_ASTRAL_RE = re.compile('[\U00010000-\U0010FFFF]')
+_ASTRAL_EXTRA = 1 if tk.TclVersion < 9.0 else 0
+
+
+def _astral_count(text, start=0, end=sys.maxsize):
+    """Count the characters of text[start:end] that Tk indexes as two columns."""
+    if not _ASTRAL_EXTRA or text.isascii():
+        return 0
+    return len(_ASTRAL_RE.findall(text, start, end))
+
+
+def advance_index(pos, n, text=''):
+    """
+    Get the Tk index n characters after pos.
+    
+    Args:
+        pos: Canonical 'line.column' index
+        n: Number of characters (Python string length)
+        text: The characters being skipped; if it holds a newline, Tk resolves the index
+        
+    Returns:
+        Index string ('line.column' when computed without Tk)
+    """
+    n += _astral_count(text)
+    if '\n' in text:
+        return f'{pos}+{n}c'
+    line, column = pos.split('.')
+    return f'{line}.{int(column) + n}'
+
+
+class LiteralPattern:
+    """
+    Case-sensitive plain search text, matched with str.find instead of re.
+    
+    Accepted wherever the editor takes a compiled search pattern.
+    """
+    
+    __slots__ = ('pattern',)
+    
+    def __init__(self, text):
+        self.pattern = text
+    
+    def fullmatch(self, string):
+        """Check whether string is exactly the search text."""
+        return string == self.pattern
+
+
+def _iter_spans(pattern, buf, pos=0):
+    """Yield (start, end) of the non-empty matches at or after pos."""
+    if isinstance(pattern, LiteralPattern):
+        # str.find runs CPython's C fast search - no regex engine involved
+        text = pattern.pattern
+        if not text:
+            return
+        find = buf.find
+        start = find(text, pos)
+        while start != -1:
+            end = start + len(text)
+            yield start, end
+            start = find(text, end)
+        return
+    
+    for match in pattern.finditer(buf, pos):
+        if match.end() > match.start():
+            yield match.span()
+
+
+def _first_span(pattern, buf, pos):
+    """Get the (start, end) of the first non-empty match at or after pos."""
+    return next(_iter_spans(pattern, buf, pos), None)
 
 
 class LineNumbers(tk.Canvas):
@@ -102,6 +201,9 @@ class TextEditor(tk.Frame):
     autocomplete, and more.
     """
     
+    # Performance limit for occurrence highlighting
+    MAX_OCCURRENCES = 100
+    
     def __init__(self, parent, **kwargs):
         """
         Initialize the text editor.
@@ -118,7 +220,7 @@ class TextEditor(tk.Frame):
         self.theme = 'light'
         
         # Occurrence highlighting
-        self.occurrence_tag = 'occurrence'
+        self.occurrence_tag = _IDX_OCC_TAG
         self.search_tag = 'search'
         self.current_line_tag = 'current_line'
         self.occurrence_positions = []  # List of (start, end) positions
@@ -126,6 +228,13 @@ class TextEditor(tk.Frame):
         self.occurrence_highlight_enabled = True  # Toggle for feature
         self.highlighted_word = None  # Currently highlighted word
         
+        # (edit count, buffer text) as of the last whole-buffer read
+        self._buffer_snapshot = (-1, '')
+        
+        # Coalesced timers for keystroke/selection driven work
+        self._highlight_timer = CoalescingTimer(self, 100, self._update_highlighting)
+        self._selection_timer = CoalescingTimer(self, 150, self._check_selection)
+        
         self._setup_ui()
         self._setup_bindings()
     
@@ -158,6 +267,8 @@ class TextEditor(tk.Frame):
             pady=5,
             insertwidth=2,
         )
+        self.text.tk.eval(_EDIT_COUNTER_TCL.replace('WIDGET', self.text._w))
+        self._edit_count_var = f'np2_edits({self.text._w})'
         
         # Scrollbars
         self.v_scroll = ttk.Scrollbar(self.container, orient=tk.VERTICAL, command=self.text.yview)
@@ -219,8 +330,8 @@ class TextEditor(tk.Frame):
         
         # Settings - Load from Manager to ensure correct initial state
         try:
-            from utils.settings import SettingsManager
-            settings = SettingsManager().settings
+            from utils.settings import get_settings_manager
+            settings = get_settings_manager().settings
             self.highlight_occurrences_enabled = settings.highlight_occurrences
             self.set_word_wrap(settings.word_wrap)
             self.theme = settings.theme # Theme is applied above but store it
@@ -264,9 +375,7 @@ class TextEditor(tk.Frame):
         self._highlight_current_line()
         
         # Schedule highlighting update
-        if hasattr(self, '_highlight_job') and self._highlight_job:
-            self.after_cancel(self._highlight_job)
-        self._highlight_job = self.after(100, self._update_highlighting)
+        self._highlight_timer.schedule()
         
         # Update line numbers
         self.line_numbers.redraw()
@@ -285,9 +394,7 @@ class TextEditor(tk.Frame):
         self._highlight_current_line()
         
         # Debounce selection changes
-        if hasattr(self, '_selection_job') and self._selection_job:
-            self.after_cancel(self._selection_job)
-        self._selection_job = self.after(150, self._check_selection)
+        self._selection_timer.schedule()
         
         # Log selection change time
         import time
@@ -309,18 +416,16 @@ class TextEditor(tk.Frame):
         if not getattr(self, 'highlight_occurrences_enabled', True):
             return
             
-        try:
-            sel_start = self.text.index('sel.first')
-            sel_end = self.text.index('sel.last')
-            selected = self.text.get(sel_start, sel_end).strip()
+        ranges = self.text.tag_ranges('sel')
+        if ranges:
+            selected = self.text.get(ranges[0], ranges[1]).strip()
             
             if selected and len(selected) > 1 and len(selected) <= 50:
                 self.highlight_all_occurrences(selected)
-            else:
-                self._maybe_clear_occurrences()
-        except tk.TclError:
-            # No selection - clear highlights
-            self._maybe_clear_occurrences()
+                return
+        
+        # No (usable) selection - clear highlights
+        self._maybe_clear_occurrences()
     
     def _maybe_clear_occurrences(self):
         """Clear occurrence highlights if not in double-click mode."""
@@ -362,25 +467,42 @@ class TextEditor(tk.Frame):
         else:
             self.occurrence_label.configure(text='')
     
+    def _get_visible_lines(self):
+        """
+        Get the approximate range of visible lines.
+        
+        Returns:
+            Tuple of (first_line, last_line)
+        """
+        # Optimization: Use yview for fractional position to avoid expensive pixel calculations
+        # index('@0,0') forces layout calculation which lags on long lines
+        top, bottom = self.text.yview()
+        
+        # Get total lines efficiently
+        # using 'end-1c' index parsing is fast
+        total_index = self.text.index('end-1c')
+        total_lines = int(total_index.split('.')[0])
+        
+        # Calculate visible line range
+        # Add small buffer to ensure coverage
+        start_line = max(1, int(top * total_lines))
+        end_line = min(total_lines, int(bottom * total_lines) + 2)
+        return start_line, end_line
+    
+    def _highlight_visible_first(self):
+        """Highlight the viewport now and the rest of the document when idle."""
+        try:
+            start_line, end_line = self._get_visible_lines()
+        except Exception:
+            start_line, end_line = 1, 1
+        self.highlighter.highlight_progressive(start_line, end_line)
+    
     def _update_highlighting(self):
         """Update syntax highlighting for visible region."""
         import time
         t_start = time.time()
         try:
-            # Optimization: Use yview for fractional position to avoid expensive pixel calculations
-            # index('@0,0') forces layout calculation which lags on long lines
-            top, bottom = self.text.yview()
-            
-            # Get total lines efficiently
-            # using 'end-1c' index parsing is fast
-            total_index = self.text.index('end-1c')
-            total_lines = int(total_index.split('.')[0])
-            
-            # Calculate visible line range
-            # Add small buffer to ensure coverage
-            start_line = max(1, int(top * total_lines))
-            end_line = min(total_lines, int(bottom * total_lines) + 2)
-            
+            start_line, end_line = self._get_visible_lines()
             self.highlighter.highlight_region(f"{start_line}.0", f"{end_line}.0")
             
             self._log_method('_update_highlighting', t_start)
@@ -412,6 +534,9 @@ class TextEditor(tk.Frame):
             filepath: Optional file path
             encoding: File encoding
         """
+        # Drop background highlighting queued for the previous content
+        self.highlighter.cancel_pending()
+        
         self.text.delete('1.0', 'end')
         self.text.insert('1.0', content)
         
@@ -466,7 +591,7 @@ class TextEditor(tk.Frame):
         
         # Apply highlighting (skip in performance mode)
         if not self._performance_mode:
-            self.highlighter.highlight_all()
+            self._highlight_visible_first()
         self.line_numbers.redraw()
     
     def get_content(self):
@@ -482,7 +607,8 @@ class TextEditor(tk.Frame):
         """
         self.language = language
         self.highlighter.set_language(language)
-        self.highlighter.highlight_all()
+        if not getattr(self, '_performance_mode', False):
+            self._highlight_visible_first()
     
     def set_theme(self, theme):
         """
@@ -495,12 +621,13 @@ class TextEditor(tk.Frame):
         self.highlighter.set_theme(theme)
         self._apply_theme()
     
-    def highlight_all_occurrences(self, text):
+    def highlight_all_occurrences(self, text, pattern=None):
         """
         Highlight all occurrences of text.
         
         Args:
             text: Text to highlight
+            pattern: Precompiled re.Pattern or LiteralPattern to match instead of the plain text
         """
         # Clear previous highlights
         self.clear_occurrence_highlights()
@@ -512,42 +639,55 @@ class TextEditor(tk.Frame):
             self._hide_occurrence_bar()
             return 0
         
-        # Find and highlight all occurrences
-        start = '1.0'
-        count = 0
-        max_matches = 100 # Performance limit
+        # One regex scan of the buffer snapshot, which is only re-read after an edit
+        if pattern is None:
+            pattern = re.compile(re.escape(text), re.IGNORECASE)
+        return self.show_occurrences(text, self._match_ranges(pattern, self.MAX_OCCURRENCES))
+    
+    def show_occurrences(self, text, ranges):
+        """
+        Highlight already-known occurrences of text.
         
-        while count < max_matches:
-            pos = self.text.search(text, start, stopindex='end', nocase=True)
-            if not pos:
-                break
+        Args:
+            text: Text the ranges match
+            ranges: List of (start, end) Tk indices
             
-            end = f'{pos}+{len(text)}c'
-            self.text.tag_add(self.occurrence_tag, pos, end)
-            self.occurrence_positions.append((pos, end))
-            start = end
-            count += 1
+        Returns:
+            Number of occurrences
+        """
+        self.clear_occurrence_highlights()
+        self.highlighted_word = text
+        self.occurrence_positions = list(ranges)
+        count = len(self.occurrence_positions)
         
         # Show navigation bar if occurrences found
         if count > 0:
+            # Highlight them all with a single Tcl call
+            self.text.tag_add(self.occurrence_tag, *(index for span in self.occurrence_positions for index in span))
+            
             # Try to find current selection in occurrences to set index
-            try:
-                sel_start = self.text.index('sel.first')
+            # (both sides are canonical line.column strings)
+            ranges = self.text.tag_ranges('sel')
+            if ranges:
+                sel_start = str(ranges[0])
                 for i, (pos, _) in enumerate(self.occurrence_positions):
-                    if self.text.compare(pos, '==', sel_start):
+                    if pos == sel_start:
                         self.current_occurrence_index = i
                         break
-            except tk.TclError:
-                pass
                 
             self._show_occurrence_bar()
             self._update_occurrence_bar()
+        else:
+            self._hide_occurrence_bar()
         
         return count
     
     def clear_occurrence_highlights(self):
         """Clear all occurrence highlights."""
-        self.text.tag_remove(self.occurrence_tag, '1.0', 'end')
+        # Only the span between the first and last highlighted range
+        ranges = self.text.tag_ranges(self.occurrence_tag)
+        if ranges:
+            self.text.tag_remove(self.occurrence_tag, ranges[0], ranges[-1])
         self.occurrence_positions = []
         self.current_occurrence_index = -1
     
@@ -564,23 +704,9 @@ class TextEditor(tk.Frame):
         self.current_occurrence_index = (self.current_occurrence_index + 1) % len(self.occurrence_positions)
         pos, end = self.occurrence_positions[self.current_occurrence_index]
         
-        self.text.mark_set('insert', pos)
-        self.text.mark_set('insert', pos)
+        self.text.mark_set(_IDX_INSERT, pos)
         self.text.see(pos)
-        # Scroll a bit more to show context if possible (center it)
-        try:
-            self.text.update_idletasks()
-            line_info = self.text.dlineinfo(pos)
-            if line_info is None: # Not visible yet, force center
-                # Quick scroll to center: see -> get y -> scroll
-                # Tkinter see() brings it into view. To center, we need math.
-                # Simple hack: see, then scroll up a few lines if at top
-                pass
-        except Exception:
-            pass
-            
-        self.text.tag_remove('sel', '1.0', 'end')
-        self.text.tag_remove('sel', '1.0', 'end')
+        self.text.tag_remove('sel', _IDX_START, _IDX_END)
         self.text.tag_add('sel', pos, end)
         self._update_occurrence_bar()
         return True
@@ -598,11 +724,9 @@ class TextEditor(tk.Frame):
         self.current_occurrence_index = (self.current_occurrence_index - 1) % len(self.occurrence_positions)
         pos, end = self.occurrence_positions[self.current_occurrence_index]
         
-        self.text.mark_set('insert', pos)
-        self.text.mark_set('insert', pos)
+        self.text.mark_set(_IDX_INSERT, pos)
         self.text.see(pos)
-        self.text.tag_remove('sel', '1.0', 'end')
-        self.text.tag_remove('sel', '1.0', 'end')
+        self.text.tag_remove('sel', _IDX_START, _IDX_END)
         self.text.tag_add('sel', pos, end)
         self._update_occurrence_bar()
         return True
@@ -624,11 +748,11 @@ class TextEditor(tk.Frame):
             return
             
         # Remove existing highlight
-        self.text.tag_remove(self.current_line_tag, '1.0', 'end')
+        self.text.tag_remove(self.current_line_tag, _IDX_START, _IDX_END)
         
         # Add highlight to current line
         try:
-            line_str = self.text.index('insert').split('.')[0]
+            line_str = self.text.index(_IDX_INSERT).split('.')[0]
             line = int(line_str)
             start = f'{line}.0'
             end = f'{line + 1}.0'
@@ -645,7 +769,8 @@ class TextEditor(tk.Frame):
     def _log_method(self, name, start):
         pass
     
-    def find_text(self, text, case_sensitive=False, whole_word=False, regex=False, start=None):
+    def find_text(self, text, case_sensitive=False, whole_word=False, regex=False, start=None,
+                  pattern=None, backwards=False):
         """
         Find text in the editor.
         
@@ -655,6 +780,8 @@ class TextEditor(tk.Frame):
             whole_word: Match whole words only
             regex: Use regex search
             start: Starting position
+            pattern: Precompiled re.Pattern or LiteralPattern (overrides the options above)
+            backwards: Search towards the start of the buffer (pattern only)
             
         Returns:
             Position of found text or None
@@ -662,43 +789,158 @@ class TextEditor(tk.Frame):
         if not text:
             return None
         
+        if pattern is not None:
+            return self._find_pattern(pattern, start, backwards)
+        
         if start is None:
             start = self.text.index('insert+1c')
         
         # Search options
         nocase = not case_sensitive
+        match_len = self.get_match_length_var()
         
         # Perform search
         pos = self.text.search(
             text, 
             start, 
-            stopindex='end', 
+            stopindex=_IDX_END, 
             nocase=nocase,
-            regexp=regex
+            regexp=regex,
+            count=match_len
         )
         
         # Wrap around if not found
         if not pos:
             pos = self.text.search(
                 text, 
-                '1.0', 
+                _IDX_START, 
                 stopindex=start, 
                 nocase=nocase,
-                regexp=regex
+                regexp=regex,
+                count=match_len
             )
         
         if pos:
             # Highlight found text (S01 Fix: Don't select, just highlight)
-            end = f'{pos}+{len(text)}c'
-            self.text.tag_remove(self.search_tag, '1.0', 'end')
-            self.text.tag_add(self.search_tag, pos, end)
-            self.text.mark_set('insert', end)
+            end = f'{pos}+{match_len.get()}c' if regex else advance_index(pos, len(text), text)
+            self._set_search_highlight(pos, end)
+            self.text.mark_set(_IDX_INSERT, end)
             self.text.see(pos)
             # S01 Fix: Removed tag_add('sel')
         
         return pos
     
-    def replace_text(self, find_text, replace_text, case_sensitive=False):
+    def _find_pattern(self, pattern, start=None, backwards=False):
+        """
+        Find the next (or previous) regex match, wrapping around the buffer.
+        
+        Returns:
+            Position of found text or None
+        """
+        buf = self._buffer_text()
+        if start is None:
+            start = _IDX_INSERT if backwards else 'insert+1c'
+        offset = (self.text.count(_IDX_START, start, 'chars') or (0,))[0]
+        if _astral_count(buf, 0, offset):
+            # Tk counted wide characters twice - measure the prefix in Python characters
+            offset = len(self.text.get(_IDX_START, start))
+        
+        if backwards:
+            spans = list(_iter_spans(pattern, buf))
+            before = [span for span in spans if span[0] < offset]
+            found = before[-1] if before else (spans[-1] if spans else None)
+        else:
+            found = _first_span(pattern, buf, offset) or _first_span(pattern, buf, 0)
+        
+        if found is None:
+            return None
+        
+        pos, end = self._spans_to_indices(buf, [found])[0]
+        self._set_search_highlight(pos, end)
+        self.text.mark_set(_IDX_INSERT, pos if backwards else end)
+        self.text.see(pos)
+        return pos
+    
+    def _set_search_highlight(self, pos, end):
+        """Move the search highlight to a new match."""
+        # Remove only the previous match's range rather than scanning 1.0-end;
+        # tag_ranges follows the tag through edits, unlike stored indices
+        previous = self.text.tag_ranges(self.search_tag)
+        if previous:
+            self.text.tag_remove(self.search_tag, *previous)
+        self.text.tag_add(self.search_tag, pos, end)
+    
+    def _match_ranges(self, pattern, limit=None):
+        """
+        Run a compiled regex over the whole buffer.
+        
+        Args:
+            pattern: Compiled re.Pattern or LiteralPattern
+            limit: Maximum number of matches (None for all; the scan stops at the limit)
+            
+        Returns:
+            List of (start, end) Tk indices of non-empty matches
+        """
+        buf = self._buffer_text()
+        return self._spans_to_indices(buf, list(islice(_iter_spans(pattern, buf), limit)))
+    
+    def _buffer_text(self):
+        """
+        Get the whole buffer text, reusing the last copy until the next edit.
+        
+        Returns:
+            Buffer text without the trailing newline
+        """
+        # Read at call time - the counter is bumped synchronously by each edit
+        count = self.text.tk.globalgetvar(self._edit_count_var)
+        cached_count, buf = self._buffer_snapshot
+        if count != cached_count:
+            buf = self.text.get(_IDX_START, 'end-1c')
+            self._buffer_snapshot = (count, buf)
+        return buf
+    
+    @staticmethod
+    def _spans_to_indices(buf, spans):
+        """
+        Convert sorted (start, end) Python string offsets into Tk line.column indices.
+        
+        Args:
+            buf: Buffer text the offsets refer to
+            spans: Offsets in ascending order
+            
+        Returns:
+            List of (start, end) Tk indices
+        """
+        if not spans:
+            return []
+        
+        # Offsets where each line starts, up to the last match
+        line_starts = [0]
+        line_starts.extend(m.end() for m in _NEWLINE_RE.finditer(buf, 0, spans[-1][1]))
+        # Columns are in Tk units, which differ only when wide characters precede a match
+        wide = _astral_count(buf, 0, spans[-1][1]) > 0
+        
+        def to_index(offset):
+            line = bisect_right(line_starts, offset) - 1
+            column = offset - line_starts[line]
+            if wide:
+                column += _astral_count(buf, line_starts[line], offset)
+            return f'{line + 1}.{column}'
+        
+        return [(to_index(start), to_index(end)) for start, end in spans]
+    
+    def get_match_length_var(self):
+        """
+        Get the variable Tk search stores the match length in.
+        
+        Returns:
+            IntVar (regex matches can differ in length from the pattern)
+        """
+        if not hasattr(self, '_match_length_var'):
+            self._match_length_var = tk.IntVar(self)
+        return self._match_length_var
+    
+    def replace_text(self, find_text, replace_text, case_sensitive=False, pattern=None):
         """
         Replace current selection or find next.
         
@@ -706,47 +948,39 @@ class TextEditor(tk.Frame):
             find_text: Text to find
             replace_text: Replacement text
             case_sensitive: Case sensitive search
+            pattern: Precompiled re.Pattern or LiteralPattern the selection must match
             
         Returns:
             True if replaced
         """
         try:
             # S01 Fix: Check selection OR search tag
-            target_start = None
-            target_end = None
-            
-            # First check selection
-            try:
-                target_start = self.text.index('sel.first')
-                target_end = self.text.index('sel.last')
-            except tk.TclError:
-                # No selection, check search tag
-                ranges = self.text.tag_ranges(self.search_tag)
-                if ranges:
-                    target_start = ranges[0]
-                    target_end = ranges[1]
-            
-            if not target_start:
+            ranges = self.text.tag_ranges('sel') or self.text.tag_ranges(self.search_tag)
+            if not ranges:
                 return False
+            target_start, target_end = ranges[0], ranges[1]
                 
             selected = self.text.get(target_start, target_end)
             
             # Check if text matches
-            match = (selected == find_text if case_sensitive 
-                    else selected.lower() == find_text.lower())
+            if pattern is not None:
+                match = bool(pattern.fullmatch(selected))
+            else:
+                match = (selected == find_text if case_sensitive 
+                        else selected.lower() == find_text.lower())
             
             if match:
-                self.text.delete(target_start, target_end)
-                self.text.insert(sel_start, replace_text)
+                # Single Tcl call (Tk 8.6+) - also keeps the edit as one undo step
+                self.text.replace(target_start, target_end, replace_text)
                 return True
         except tk.TclError:
             pass
         
         # Find next
-        self.find_text(find_text, case_sensitive)
+        self.find_text(find_text, case_sensitive, pattern=pattern)
         return False
     
-    def replace_all(self, find_text, replace_text, case_sensitive=False):
+    def replace_all(self, find_text, replace_text, case_sensitive=False, pattern=None):
         """
         Replace all occurrences.
         
@@ -754,6 +988,7 @@ class TextEditor(tk.Frame):
             find_text: Text to find
             replace_text: Replacement text
             case_sensitive: Case sensitive search
+            pattern: Precompiled re.Pattern or LiteralPattern to match instead of the plain text
             
         Returns:
             Number of replacements
@@ -761,19 +996,26 @@ class TextEditor(tk.Frame):
         if not find_text:
             return 0
         
+        if pattern is not None:
+            # Replace back to front so earlier indices stay valid
+            ranges = self._match_ranges(pattern)
+            for pos, end in reversed(ranges):
+                self.text.replace(pos, end, replace_text)
+            return len(ranges)
+        
         count = 0
-        start = '1.0'
+        start = _IDX_START
         nocase = not case_sensitive
         
         while True:
-            pos = self.text.search(find_text, start, stopindex='end', nocase=nocase)
+            pos = self.text.search(find_text, start, stopindex=_IDX_END, nocase=nocase)
             if not pos:
                 break
             
-            end = f'{pos}+{len(find_text)}c'
+            end = advance_index(pos, len(find_text), find_text)
             self.text.delete(pos, end)
             self.text.insert(pos, replace_text)
-            start = f'{pos}+{len(replace_text)}c'
+            start = advance_index(pos, len(replace_text), replace_text)
             count += 1
         
         return count
@@ -851,7 +1093,7 @@ class TextEditor(tk.Frame):
     
     def select_all(self):
         """Select all text."""
-        self.text.tag_add('sel', '1.0', 'end')
+        self.text.tag_add('sel', _IDX_START, _IDX_END)
     
     def mark_saved(self):
         """Mark the file as saved."""
@@ -860,8 +1102,18 @@ class TextEditor(tk.Frame):
     
     def destroy(self):
         """Clean up resources."""
+        self._highlight_timer.cancel()
+        self._selection_timer.cancel()
+        if hasattr(self, 'highlighter'):
+            self.highlighter.cancel_pending()
         if hasattr(self, 'autocomplete'):
             self.autocomplete.destroy()
+        # Drop the edit-counting wrapper; Tk removes the real widget command
+        try:
+            self.text.tk.call('rename', self.text._w, '')
+            self.text.tk.globalunsetvar(self._edit_count_var)
+        except (AttributeError, tk.TclError):
+            pass
         super().destroy()
 
     def get_cursor_position(self):
@@ -7,11 +7,44 @@ import os
 import re
 import subprocess
 import threading
+import sys
+from collections import Counter, deque
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, List, Optional
 
+# Line a linter daemon prints after the results for each request
+DAEMON_SENTINEL = '\x00NP2-END'
 
-@dataclass
+# Long-lived pylint, started in the linted file's directory so project
+# config (.pylintrc, pyproject.toml, ...) is found exactly as a one-shot
+# run would find it. Reads one file path per stdin line, answers with
+# formatted results followed by DAEMON_SENTINEL
+PYLINT_DAEMON_SCRIPT = '''
+import sys
+from astroid import MANAGER
+from pylint.lint import Run
+ARGS = ['--output-format=text', '--msg-template={line}:{column}: {msg_id}: {msg}',
+        '--score=n', '--reports=n']
+for path in sys.stdin:
+    path = path.rstrip('\\n')
+    # Forget the previous AST of this file - its content changes between runs
+    for name, module in list(MANAGER.astroid_cache.items()):
+        if getattr(module, 'file', None) == path:
+            del MANAGER.astroid_cache[name]
+    try:
+        Run(ARGS + [path], exit=False)
+    except BaseException:
+        # Bad configs make pylint call sys.exit - keep serving
+        pass
+    sys.stdout.write(SENTINEL + '\\n')
+    sys.stdout.flush()
+'''.replace('SENTINEL', repr(DAEMON_SENTINEL))
+
+# __slots__ dataclasses need Python 3.10+; older versions fall back to a __dict__
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class LintError:
     """Represents a linting error or warning."""
     line: int
@@ -21,6 +54,19 @@ class LintError:
     code: Optional[str] = None
 
 
+def index_errors_by_line(errors: List[LintError]) -> Dict[int, List[LintError]]:
+    """Group errors by line number for O(1) per-line lookups."""
+    by_line: Dict[int, List[LintError]] = {}
+    for error in errors:
+        by_line.setdefault(error.line, []).append(error)
+    return by_line
+
+
+def lint_fingerprint(errors: List[LintError]) -> tuple:
+    """Exact, comparable summary of an error list, used to skip redrawing identical results."""
+    return tuple((e.line, e.column, e.severity, e.code, e.message) for e in errors)
+
+
 class Linter:
     """Runs external linters and parses results."""
     
@@ -35,7 +81,10 @@ class Linter:
                 'W': 'warning',  # Warning
                 'C': 'info',     # Convention
                 'R': 'info',     # Refactor
-            }
+            },
+            'fast_parse': True,
+            'stdin_args': ['--from-stdin', '{filepath}'],
+            'daemon': ['python', '-c', PYLINT_DAEMON_SCRIPT],
         },
         'python_flake8': {
             'command': ['python', '-m', 'flake8', '--format=%(row)d:%(col)d: %(code)s: %(text)s'],
@@ -44,10 +93,23 @@ class Linter:
                 'E': 'error',
                 'W': 'warning',
                 'F': 'error',
-            }
+            },
+            'fast_parse': True,
+            'stdin_args': ['--stdin-display-name', '{filepath}', '-'],
         },
     }
     
+    # Quiet period before a queued lint request runs (seconds)
+    DEBOUNCE_SECONDS = 0.15
+    # Kill subprocess linters that run longer than this (seconds)
+    TIMEOUT_SECONDS = 30
+    # Push partial results to on_results every N parsed problems
+    PARTIAL_RESULTS_EVERY = 50
+    # Persistent linter processes kept at once (one per project directory)
+    MAX_DAEMONS = 4
+    # Copies of editor buffers for linters that can only read files
+    TEMP_DIR = os.path.join(os.path.expanduser('~'), '.np2', 'temp')
+    
     def __init__(self, on_results=None):
         """
         Initialize the linter.
@@ -58,6 +120,21 @@ class Linter:
         self.on_results = on_results
         self.current_process = None
         self.errors: List[LintError] = []
+        self._by_line: Dict[int, List[LintError]] = {}
+        
+        # Single worker thread fed by a one-slot "latest request wins" mailbox
+        self._request_lock = threading.Lock()
+        self._pending = None
+        self._generation = 0
+        self._wake = threading.Event()
+        self._debounce_timer = None
+        
+        # Persistent linter processes keyed by (command, cwd)
+        self._daemons: Dict[tuple, subprocess.Popen] = {}
+        self._failed_daemons = set()
+        
+        self._worker = threading.Thread(target=self._worker_loop, daemon=True)
+        self._worker.start()
     
     def lint_file(self, filepath, language='python', cwd=None):
         """
@@ -68,114 +145,386 @@ class Linter:
             language: Programming language
             cwd: Working directory (optional, defaults to file dir)
         """
+        self._queue(filepath, language, cwd)
+    
+    def lint_source(self, source, filepath, language='python', cwd=None, encoding='utf-8'):
+        """
+        Run linting on unsaved editor content.
+        
+        Args:
+            source: Current editor text
+            filepath: Path the text belongs to (used for messages and imports)
+            language: Programming language
+            cwd: Working directory (optional, defaults to file dir)
+            encoding: Encoding for linters that need the text written to a file
+        """
+        self._queue(filepath, language, cwd, (source, encoding))
+    
+    def _queue(self, filepath, language, cwd, source=None):
+        """Hand a lint request to the worker thread."""
         # Get linter config
         config = self.LINTERS.get(language)
         if not config:
-            self.errors = []
+            # A run for the previous language must not overwrite the empty result
+            self.cancel()
+            self._set_errors([])
             if self.on_results:
                 self.on_results([])
             return
         
-        # Run linting in background
-        thread = threading.Thread(
-            target=self._run_linter,
-            args=(filepath, config, cwd),
-            daemon=True
-        )
-        thread.start()
+        # Supersede any queued or running request
+        self.cancel()
+        with self._request_lock:
+            self._generation += 1
+            self._pending = (filepath, config, cwd, self._generation, source)
+            
+            # Debounce: only wake the worker once requests stop arriving
+            self._debounce_timer = threading.Timer(self.DEBOUNCE_SECONDS, self._wake.set)
+            self._debounce_timer.daemon = True
+            self._debounce_timer.start()
     
-    def _run_linter(self, filepath, config, cwd=None):
+    def _worker_loop(self):
+        """Drain lint requests on the persistent worker thread."""
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            
+            with self._request_lock:
+                request = self._pending
+                self._pending = None
+            
+            if request:
+                self._run_linter(*request)
+    
+    def _is_current(self, generation):
+        """Check whether a request has not been superseded."""
+        return generation is None or generation == self._generation
+    
+    def _run_linter(self, filepath, config, cwd=None, generation=None, source=None):
         """Run linter in background thread."""
+        # Determine CWD
+        if cwd is None:
+            cwd = os.path.dirname(filepath)
+        
+        # Daemons can only read files
+        if source is not None and config.get('daemon'):
+            try:
+                filepath = self._write_temp_copy(filepath, *source)
+                source = None
+            except OSError:
+                pass
+        
+        # Prefer a long-lived linter process that already paid its startup
+        if config.get('daemon') and source is None \
+                and self._run_daemon(filepath, config, cwd, generation):
+            return
+        
         try:
-            # Build command
-            command = config['command'] + [filepath]
-            
-            # Determine CWD
-            if cwd is None:
-                cwd = os.path.dirname(filepath)
+            # Build command - unsaved text is piped through stdin
+            if source is not None and config.get('stdin_args'):
+                command = config['command'] + [arg.format(filepath=filepath) for arg in config['stdin_args']]
+                stdin_data = source[0].encode(source[1], 'replace')
+            else:
+                if source is not None:
+                    filepath = self._write_temp_copy(filepath, *source)
+                command = config['command'] + [filepath]
+                stdin_data = None
             
             # Run linter
-            self.current_process = subprocess.Popen(
+            process = subprocess.Popen(
                 command,
+                stdin=subprocess.PIPE if stdin_data is not None else None,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
+                stderr=subprocess.DEVNULL,
+                bufsize=0,
                 cwd=cwd,
             )
+            self.current_process = process
             
-            stdout, stderr = self.current_process.communicate(timeout=30)
+            watchdog, timed_out = self._start_watchdog(process)
+            try:
+                if stdin_data is not None:
+                    # Linters read all input before reporting, so this cannot deadlock
+                    with process.stdin:
+                        process.stdin.write(stdin_data)
+                errors, _ = self._read_errors(self._iter_output_lines(process.stdout), config, generation)
+                process.wait()
+            finally:
+                watchdog.cancel()
             
-            # Parse output
-            errors = self._parse_output(stdout, config)
+            # Drop results of a run that timed out, was cancelled or superseded
+            if timed_out.is_set() or not self._is_current(generation):
+                return
             
-            self.errors = errors
+            self._set_errors(errors)
             
             if self.on_results:
                 self.on_results(errors)
                 
-        except subprocess.TimeoutExpired:
-            if self.current_process:
-                self.current_process.kill()
         except FileNotFoundError:
             # Linter not installed
-            self.errors = []
-            if self.on_results:
-                self.on_results([])
+            if self._is_current(generation):
+                self._set_errors([])
+                if self.on_results:
+                    self.on_results([])
         except Exception:
-            self.errors = []
-            if self.on_results:
-                self.on_results([])
+            if self._is_current(generation):
+                self._set_errors([])
+                if self.on_results:
+                    self.on_results([])
         finally:
             self.current_process = None
     
-    def _parse_output(self, output, config) -> List[LintError]:
-        """Parse linter output into LintError objects."""
+    def _run_daemon(self, filepath, config, cwd, generation=None):
+        """
+        Lint a file through a persistent linter process.
+        
+        Returns:
+            True if the request was handled, False to fall back to a one-shot process
+        """
+        key = (tuple(config['daemon']), cwd)
+        if key in self._failed_daemons:
+            return False
+        
+        process = self._daemons.get(key)
+        spawned = process is None or process.poll() is not None
+        if spawned:
+            self._daemons.pop(key, None)
+            if len(self._daemons) >= self.MAX_DAEMONS:
+                # Retire the least recently started daemon
+                oldest = next(iter(self._daemons))
+                self._daemons.pop(oldest).kill()
+            try:
+                process = subprocess.Popen(
+                    config['daemon'],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    bufsize=0,
+                    cwd=cwd,
+                )
+            except OSError:
+                self._failed_daemons.add(key)
+                return False
+            self._daemons[key] = process
+        
+        # Not exposed as current_process: cancel() must not kill a daemon - a
+        # superseded answer is read to the sentinel and dropped by generation
+        watchdog, timed_out = self._start_watchdog(process)
+        try:
+            process.stdin.write(os.fsencode(filepath) + b'\n')
+            lines = self._iter_output_lines(process.stdout)
+            errors, finished = self._read_errors(lines, config, generation, DAEMON_SENTINEL)
+        except (OSError, ValueError):
+            errors, finished = [], False
+        finally:
+            watchdog.cancel()
+        
+        if not finished:
+            # Daemon died (killed on timeout, or cannot start) - respawn next time
+            self._daemons.pop(key, None)
+            if spawned and not timed_out.is_set() and self._is_current(generation):
+                # A fresh daemon exited on its own (e.g. pylint missing) - stop trying it
+                self._failed_daemons.add(key)
+                return False
+            return True
+        
+        if self._is_current(generation):
+            self._set_errors(errors)
+            if self.on_results:
+                self.on_results(errors)
+        return True
+    
+    def _start_watchdog(self, process):
+        """Kill the process if it runs longer than TIMEOUT_SECONDS."""
+        # Watchdog replaces communicate(timeout=...) while streaming
+        timed_out = threading.Event()
+        
+        def on_timeout():
+            timed_out.set()
+            process.kill()
+        
+        watchdog = threading.Timer(self.TIMEOUT_SECONDS, on_timeout)
+        watchdog.daemon = True
+        watchdog.start()
+        return watchdog, timed_out
+    
+    @staticmethod
+    def _iter_output_lines(pipe):
+        """
+        Yield decoded lines from an unbuffered binary pipe.
+        
+        Reads raw chunks with os.read (which releases the GIL while it
+        blocks) and decodes only complete lines.
+        """
+        fd = pipe.fileno()
+        pending = b''
+        while True:
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                break
+            pending += chunk
+            if b'\n' not in chunk:
+                continue
+            *complete, pending = pending.split(b'\n')
+            for raw_line in complete:
+                yield raw_line.decode('utf-8', 'replace') + '\n'
+        if pending:
+            yield pending.decode('utf-8', 'replace')
+    
+    def _read_errors(self, stream, config, generation=None, sentinel=None):
+        """
+        Parse linter output line by line as the linter produces it.
+        
+        Returns:
+            Tuple of (errors, True if the sentinel line was reached)
+        """
         errors = []
-        pattern = re.compile(config['pattern'], re.MULTILINE)
-        severity_map = config.get('severity_map', {})
+        parse_line = self._line_parser(config)
+        
+        for output_line in stream:
+            if sentinel is not None and output_line.rstrip('\n') == sentinel:
+                return errors, True
+            
+            error = parse_line(output_line)
+            if error is None:
+                continue
+            errors.append(error)
+            
+            # Let the UI show the first problems while the linter runs
+            if len(errors) % self.PARTIAL_RESULTS_EVERY == 0 and self._is_current(generation):
+                if self.on_results:
+                    self.on_results(list(errors))
         
-        for match in pattern.finditer(output):
+        return errors, sentinel is None
+    
+    def shutdown(self):
+        """Cancel linting and stop any persistent linter processes."""
+        self.cancel()
+        for process in self._daemons.values():
             try:
-                line = int(match.group(1))
-                column = int(match.group(2))
-                code = match.group(3)
-                message = match.group(4)
-                
-                # Determine severity from code prefix
-                severity = severity_map.get(code[0], 'info')
-                
-                errors.append(LintError(
-                    line=line,
-                    column=column,
-                    message=message,
-                    severity=severity,
-                    code=code,
-                ))
+                process.kill()
             except Exception:
                 pass
+        self._daemons.clear()
+    
+    def _write_temp_copy(self, filepath, source, encoding='utf-8'):
+        """
+        Write editor text to a temp file named after the original.
+        
+        Returns:
+            Path of the temp file
+        """
+        os.makedirs(self.TEMP_DIR, exist_ok=True)
+        temp_path = os.path.join(self.TEMP_DIR, f'lint_temp_{os.path.basename(filepath)}')
+        with open(temp_path, 'w', encoding=encoding, errors='replace') as f:
+            f.write(source)
+        return temp_path
+    
+    def _parse_output(self, output, config) -> List[LintError]:
+        """Parse linter output into LintError objects."""
+        errors = []
+        parse_line = self._line_parser(config)
+        
+        for output_line in output.splitlines():
+            error = parse_line(output_line)
+            if error is not None:
+                errors.append(error)
         
         return errors
     
+    def _line_parser(self, config):
+        """Get a function that turns one output line into a LintError (or None)."""
+        severity_get = config.get('severity_map', {}).get
+        
+        if config.get('fast_parse'):
+            return lambda line: self._parse_line_fast(line, severity_get)
+        
+        pattern_match = config['pattern'].match
+        
+        def parse_line(line):
+            match = pattern_match(line)
+            return self._error_from_match(match, severity_get) if match else None
+        
+        return parse_line
+    
+    @staticmethod
+    def _parse_line_fast(line, severity_get) -> Optional[LintError]:
+        """Parse a 'line:col: CODE: message' line with str.split instead of a regex."""
+        parts = line.split(':', 3)
+        if len(parts) != 4:
+            return None
+        
+        line_no, column, code, message = parts
+        code = code.strip()
+        message = message.strip()
+        if not (line_no.isdigit() and column.isdigit() and message
+                and len(code) > 1 and code[0].isupper() and code[1:].isdigit()):
+            return None
+        
+        return LintError(
+            line=int(line_no),
+            column=int(column),
+            message=message,
+            # Determine severity from code prefix
+            severity=severity_get(code[0], 'info'),
+            code=code,
+        )
+    
+    @staticmethod
+    def _error_from_match(match, severity_get) -> Optional[LintError]:
+        """Build a LintError from a single matched output line."""
+        try:
+            code = match.group(3)
+            return LintError(
+                line=int(match.group(1)),
+                column=int(match.group(2)),
+                message=match.group(4),
+                # Determine severity from code prefix
+                severity=severity_get(code[0], 'info'),
+                code=code,
+            )
+        except Exception:
+            return None
+    
     def cancel(self):
         """Cancel current linting operation."""
-        if self.current_process:
+        with self._request_lock:
+            self._generation += 1
+            self._pending = None
+            if self._debounce_timer:
+                self._debounce_timer.cancel()
+                self._debounce_timer = None
+        
+        process = self.current_process
+        if process and process.poll() is None:
             try:
-                self.current_process.kill()
+                process.kill()
+                process.wait(0.2)
             except Exception:
                 pass
     
+    def _set_errors(self, errors: List[LintError]):
+        """Store errors and rebuild the per-line index."""
+        self.errors = errors
+        self._by_line = index_errors_by_line(errors)
+    
     def get_errors_for_line(self, line: int) -> List[LintError]:
         """Get all errors for a specific line."""
-        return [e for e in self.errors if e.line == line]
+        return self._by_line.get(line, [])
     
     def get_error_count(self) -> dict:
         """Get count of errors by severity."""
         counts = {'error': 0, 'warning': 0, 'info': 0}
-        for error in self.errors:
-            counts[error.severity] = counts.get(error.severity, 0) + 1
+        counts.update(Counter(error.severity for error in self.errors))
         return counts
 
 
+# Compile output patterns once at import instead of on every lint run
+for _config in Linter.LINTERS.values():
+    _config['pattern'] = re.compile(_config['pattern'])
+
+
 class LintGutter:
     """Displays lint markers in the editor gutter."""
     
@@ -188,9 +537,15 @@ class LintGutter:
             line_numbers: LineNumbers canvas widget
         """
         self.text_widget = text_widget
+        self._tk = text_widget
         self.line_numbers = line_numbers
+        # Newest result from the linter thread, waiting for the Tk thread
+        self._results = deque(maxlen=1)
+        self.text_widget.bind('<<LintResults>>', self._drain_results, add='+')
         self.linter = Linter(on_results=self._on_lint_results)
         self.errors: List[LintError] = []
+        self._by_line: Dict[int, List[LintError]] = {}
+        self._last_fingerprint = None
         self.markers = {}
         
         # Configure text tags for underlining
@@ -203,8 +558,32 @@ class LintGutter:
         self.linter.lint_file(filepath, language)
     
     def _on_lint_results(self, errors: List[LintError]):
-        """Handle lint results."""
+        """Handle lint results (called on the linter worker thread)."""
+        # Tk is not thread-safe - keep the newest result and wake the main loop
+        self._results.append(errors)
+        try:
+            self._tk.event_generate('<<LintResults>>', when='tail')
+        except Exception:
+            pass  # Widget destroyed or main loop gone
+    
+    def _drain_results(self, event=None):
+        """Apply the newest queued lint result (runs on the Tk main thread)."""
+        try:
+            errors = self._results.popleft()
+        except IndexError:
+            return
+        self._apply(errors)
+    
+    def _apply(self, errors: List[LintError]):
+        """Apply lint results on the Tk main thread."""
+        # Re-linting unchanged code gives the same errors - keep the existing tags
+        fingerprint = lint_fingerprint(errors)
+        if fingerprint == self._last_fingerprint:
+            return
+        self._last_fingerprint = fingerprint
+        
         self.errors = errors
+        self._by_line = index_errors_by_line(errors)
         self._update_markers()
     
     def _update_markers(self):
@@ -214,22 +593,24 @@ class LintGutter:
         self.text_widget.tag_remove('lint_warning', '1.0', 'end')
         self.text_widget.tag_remove('lint_info', '1.0', 'end')
         
-        # Add new markers
+        # Collect ranges per severity so each tag is added in one Tcl call
+        ranges = {'error': [], 'warning': [], 'info': []}
         for error in self.errors:
-            tag = f'lint_{error.severity}'
-            
-            # Underline the error location
-            start = f'{error.line}.{error.column}'
-            end = f'{error.line}.end'
-            
+            # Underline from the error location to the end of its line
+            ranges.setdefault(error.severity, []).extend(
+                (f'{error.line}.{error.column}', f'{error.line}.end'))
+        
+        for severity, indices in ranges.items():
+            if not indices:
+                continue
             try:
-                self.text_widget.tag_add(tag, start, end)
+                self.text_widget.tag_add(f'lint_{severity}', *indices)
             except Exception:
                 pass
     
     def get_tooltip_text(self, line: int) -> Optional[str]:
         """Get tooltip text for a line."""
-        errors = self.linter.get_errors_for_line(line)
+        errors = self._by_line.get(line)
         
         if not errors:
             return None
@@ -244,4 +625,6 @@ class LintGutter:
     def clear(self):
         """Clear all lint markers."""
         self.errors = []
+        self._by_line = {}
+        self._last_fingerprint = None
         self._update_markers()
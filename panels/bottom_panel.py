@@ -2,13 +2,52 @@
 Bottom panel with tabs for Terminal and Problems (linter output).
 """
 
+import atexit
+import base64
 import os
+import queue
 import subprocess
 import threading
-import queue
+import time
+import uuid
+from collections import OrderedDict, deque
+from itertools import groupby
 import tkinter as tk
 from tkinter import ttk
 
+from linting.linter import lint_fingerprint
+from utils.file_utils import load_command_history, output_decoder, save_command_history
+
+
+# Problems list icon per lint severity
+SEVERITY_ICONS = {'error': '❌', 'warning': '⚠', 'info': 'ℹ'}
+
+# Precomputed (icon, tags) per severity so rows don't rebuild them
+_ROW_STYLES = {severity: (icon, (severity,)) for severity, icon in SEVERITY_ICONS.items()}
+
+# Terminal output keeps at most this many lines (plus slack before trimming)
+MAX_OUTPUT_LINES = 5000
+OUTPUT_TRIM_SLACK = 500
+
+# Run once when a PowerShell session starts: points the session's standard
+# input at NUL while a command runs (so programs that read stdin can't eat the
+# command stream) and decodes the base64 UTF-8 text each command arrives as
+SHELL_BOOTSTRAP = (
+    "function np2dec($s) { [Text.Encoding]::UTF8.GetString([Convert]::FromBase64String($s)) }; "
+    "try { Add-Type -Namespace NP2 -Name Native -MemberDefinition '"
+    "[DllImport(\"kernel32.dll\")] public static extern IntPtr GetStdHandle(int n); "
+    "[DllImport(\"kernel32.dll\")] public static extern bool SetStdHandle(int n, IntPtr h); "
+    "[DllImport(\"kernel32.dll\", CharSet = CharSet.Unicode)] public static extern IntPtr "
+    "CreateFile(string name, uint access, uint share, IntPtr sa, uint mode, uint flags, IntPtr tpl);'; "
+    "$np2ctl = [NP2.Native]::GetStdHandle(-10); "
+    "$np2nul = [NP2.Native]::CreateFile('NUL', 0x80000000, 3, [IntPtr]::Zero, 3, 0, [IntPtr]::Zero) "
+    "} catch { $np2nul = $null }\n"
+)
+
+# Resolved `cd` targets: how many to keep and how long before re-checking the disk
+CD_CACHE_SIZE = 64
+CD_CACHE_TTL = 5.0
+
 
 class BottomPanel(ttk.Frame):
     """Tabbed bottom panel with Terminal and Problems tabs."""
@@ -24,15 +63,30 @@ class BottomPanel(ttk.Frame):
         super().__init__(parent, **kwargs)
         
         self.on_problem_click_callback = on_problem_click
-        self.output_queue = queue.Queue()
+        # deque append/popleft are atomic - no lock per message
+        self.output_queue = deque()
         self.process = None
         self.working_dir = os.getcwd()
-        self.command_history = []
-        self.history_index = 0
+        
+        # (working dir, cd argument) -> (resolved path, is dir, checked at)
+        self._cd_cache = OrderedDict()
+        
+        # Long-lived PowerShell session shared by all commands, fed by one
+        # worker thread so starting it and writing to it never block the UI
+        self._shell = None
+        self._shell_sentinel = None
+        self._shell_commands = queue.SimpleQueue()
+        self._shell_worker = None
+        self._shell_lock = threading.Lock()
+        self._shell_pending = 0
+        self.command_history = load_command_history()
+        self.history_index = len(self.command_history)
         self.lint_errors = []
+        self._problems_fingerprint = None
+        
+        atexit.register(self._save_history)
         
         self._setup_ui()
-        self._start_update_loop()
     
     def _setup_ui(self):
         """Set up the UI."""
@@ -80,6 +134,8 @@ class BottomPanel(ttk.Frame):
             pady=5,
         )
         self.output.bind('<Button-1>', lambda e: self.input.focus_set())
+        # Reader threads wake the UI with this event instead of a polling loop
+        self.output.bind('<<TerminalOutput>>', self._drain_queue)
         
         scrollbar = ttk.Scrollbar(output_container, orient=tk.VERTICAL, command=self.output.yview)
         self.output.configure(yscrollcommand=scrollbar.set)
@@ -99,8 +155,7 @@ class BottomPanel(ttk.Frame):
         self.input.bind('<Down>', self._history_down)
         
         # Welcome message
-        self._append_output('NP2 Terminal - PowerShell\n', 'prompt')
-        self._append_output(f'Working directory: {self.working_dir}\n\n', 'prompt')
+        self._append_output(f'NP2 Terminal - PowerShell\nWorking directory: {self.working_dir}\n\n', 'prompt')
     
     def _on_tab_changed(self, event):
         """Handle tab change."""
@@ -136,6 +191,11 @@ class BottomPanel(ttk.Frame):
         self.problems_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        # Configure severity tags once
+        self.problems_tree.tag_configure('error', foreground='red')
+        self.problems_tree.tag_configure('warning', foreground='orange')
+        self.problems_tree.tag_configure('info', foreground='blue')
+        
         # Bind selection change to go to error (single click)
         self.problems_tree.bind('<<TreeviewSelect>>', self._on_problem_click)
     
@@ -167,15 +227,40 @@ class BottomPanel(ttk.Frame):
         # Execute command
         self._execute_command(command)
     
+    def _resolve_directory(self, path):
+        """
+        Resolve a cd argument against the working directory (cached).
+        
+        Returns:
+            Tuple of (absolute path, True if it is a directory)
+        """
+        key = (self.working_dir, path)
+        cached = self._cd_cache.get(key)
+        now = time.monotonic()
+        if cached and now - cached[2] < CD_CACHE_TTL:
+            self._cd_cache.move_to_end(key)
+            return cached[0], cached[1]
+        
+        resolved = path if os.path.isabs(path) else os.path.join(self.working_dir, path)
+        resolved = os.path.abspath(resolved)
+        is_dir = os.path.isdir(resolved)
+        
+        # Only hits are cached - a missing directory may be created any moment
+        if is_dir:
+            self._cd_cache[key] = (resolved, is_dir, now)
+            self._cd_cache.move_to_end(key)
+            if len(self._cd_cache) > CD_CACHE_SIZE:
+                self._cd_cache.popitem(last=False)
+        else:
+            self._cd_cache.pop(key, None)
+        return resolved, is_dir
+    
     def _change_directory(self, path):
         """Change working directory."""
         try:
-            if not os.path.isabs(path):
-                path = os.path.join(self.working_dir, path)
-            
-            path = os.path.abspath(path)
+            path, is_dir = self._resolve_directory(path)
             
-            if os.path.isdir(path):
+            if is_dir:
                 self.working_dir = path
                 os.chdir(path)
                 self.prompt_label.configure(text='> ')
@@ -186,54 +271,173 @@ class BottomPanel(ttk.Frame):
             self._append_output(f'Error: {e}\n\n', 'error')
     
     def _execute_command(self, command):
-        """Execute a shell command."""
-        def run():
+        """Queue a shell command for the persistent PowerShell session."""
+        if self._shell_worker is None:
+            self._shell_worker = threading.Thread(target=self._run_shell_commands, daemon=True)
+            self._shell_worker.start()
+        self._shell_commands.put((command, self.working_dir))
+    
+    def _run_shell_commands(self):
+        """Send queued commands to the session (runs on the worker thread)."""
+        while True:
+            command, working_dir = self._shell_commands.get()
             try:
-                full_command = f'powershell.exe -NoProfile -Command "cd \'{self.working_dir}\'; {command}"'
+                shell = self._get_shell()
                 
-                self.process = subprocess.Popen(
-                    full_command,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    shell=True,
-                    text=True,
-                    bufsize=1,
-                    cwd=self.working_dir,
+                # Pure-ASCII script: whatever encoding PowerShell reads stdin
+                # with, the base64 payloads arrive intact. Reset the exit
+                # status, run in the terminal's directory with stdin on NUL,
+                # then print the sentinel with the command's exit code
+                script = (
+                    f"$np2ok = $false; $global:LASTEXITCODE = 0; "
+                    f"if ($np2nul) {{ [void][NP2.Native]::SetStdHandle(-10, $np2nul) }}; "
+                    f"try {{ Set-Location -LiteralPath (np2dec '{self._encode_arg(working_dir)}'); "
+                    f"Invoke-Expression (np2dec '{self._encode_arg(command)}'); $np2ok = $? }} "
+                    f"finally {{ if ($np2nul) {{ [void][NP2.Native]::SetStdHandle(-10, $np2ctl) }} }}\n"
+                    f"\"`n{self._shell_sentinel} $(if ($LASTEXITCODE) {{ $LASTEXITCODE }} "
+                    f"elseif ($np2ok) {{ 0 }} else {{ 1 }})\"\n"
                 )
                 
-                for line in self.process.stdout:
-                    self.output_queue.put(('output', line))
-                
-                self.process.wait()
-                
-                if self.process.returncode != 0:
-                    self.output_queue.put(('error', f'Exit code: {self.process.returncode}\n'))
-                
-                self.output_queue.put(('done', '\n'))
-                
+                with self._shell_lock:
+                    self._shell_pending += 1
+                    self.process = shell
+                shell.stdin.write(script.encode('ascii'))
             except Exception as e:
-                self.output_queue.put(('error', f'Error: {e}\n\n'))
-            finally:
-                self.process = None
+                self._post_output('error', f'Error: {e}\n\n')
+    
+    @staticmethod
+    def _encode_arg(text):
+        """Encode text as base64 UTF-8 for np2dec in the session."""
+        return base64.b64encode(text.encode('utf-8', 'replace')).decode('ascii')
+    
+    def _get_shell(self):
+        """
+        Get the PowerShell session, starting it on first use (worker thread only).
+        
+        Returns:
+            Running subprocess.Popen
+        """
+        if self._shell is not None and self._shell.poll() is None:
+            return self._shell
+        
+        # One host for all commands - startup costs hundreds of ms per process
+        shell = subprocess.Popen(
+            ['powershell.exe', '-NoProfile', '-NoLogo', '-NonInteractive', '-Command', '-'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=0,
+            cwd=self.working_dir,
+        )
+        self._shell = shell
+        self._shell_sentinel = f'__NP2_DONE_{uuid.uuid4().hex}__'
+        with self._shell_lock:
+            self._shell_pending = 0
         
-        thread = threading.Thread(target=run, daemon=True)
+        thread = threading.Thread(
+            target=self._read_shell_output, args=(shell, self._shell_sentinel), daemon=True)
         thread.start()
+        shell.stdin.write(SHELL_BOOTSTRAP.encode('ascii'))
+        return shell
     
-    def _start_update_loop(self):
-        """Start the output update loop."""
-        try:
+    def _read_shell_output(self, shell, sentinel):
+        """Forward session output, ending each command at its sentinel line."""
+        fd = shell.stdout.fileno()
+        decoder = output_decoder()
+        pending = ''
+        
+        while True:
+            try:
+                data = os.read(fd, 65536)
+            except OSError:
+                data = b''
+            if not data:
+                break
+            pending += decoder.decode(data)
+            
+            # Complete sentinel lines end a command
             while True:
-                msg_type, text = self.output_queue.get_nowait()
+                start = pending.find(sentinel)
+                end = pending.find('\n', start) if start >= 0 else -1
+                if end < 0:
+                    break
+                # Drop the blank line the `n before the sentinel adds
+                output = pending[:start]
+                if output.endswith('\n'):
+                    output = output[:-1]
+                exit_code = pending[start + len(sentinel):end].strip()
+                pending = pending[end + 1:]
                 
-                if msg_type == 'error':
-                    self._append_output(text, 'error')
-                else:
-                    self._append_output(text)
-                    
-        except queue.Empty:
+                if output:
+                    self._post_output('output', output)
+                if exit_code != '0':
+                    self._post_output('error', f'Exit code: {exit_code}\n')
+                self._post_output('done', '\n')
+                self._finish_shell_command(shell)
+            
+            # Hold back what could be the start of a sentinel
+            if sentinel not in pending and len(pending) > len(sentinel) + 1:
+                self._post_output('output', pending[:-(len(sentinel) + 1)])
+                pending = pending[-(len(sentinel) + 1):]
+        
+        # Session ended (exit, killed): flush and release waiting commands
+        pending += decoder.decode(b'', final=True)
+        if pending and sentinel not in pending:
+            self._post_output('output', pending)
+        with self._shell_lock:
+            had_pending = self._shell_pending > 0
+            self._shell_pending = 0
+            if self.process is shell:
+                self.process = None
+        if self._shell is shell:
+            self._shell = None
+        if had_pending:
+            self._post_output('done', '\n')
+    
+    def _finish_shell_command(self, shell):
+        """Mark one queued session command as done."""
+        with self._shell_lock:
+            self._shell_pending = max(self._shell_pending - 1, 0)
+            if self._shell_pending == 0 and self.process is shell:
+                self.process = None
+    
+    def _post_output(self, msg_type, text):
+        """Queue output from a reader thread and wake the UI to drain it."""
+        self.output_queue.append((msg_type, text))
+        try:
+            self.output.event_generate('<<TerminalOutput>>', when='tail')
+        except (tk.TclError, RuntimeError):
+            pass  # Panel destroyed or main loop gone
+    
+    def _drain_queue(self, event=None):
+        """Append all queued output (runs on the Tk main thread)."""
+        items = []
+        popleft = self.output_queue.popleft
+        try:
+            while True:
+                items.append(popleft())
+        except IndexError:
             pass
         
-        self.after(50, self._start_update_loop)
+        if not items:
+            return
+        
+        # Join runs with the same tag and insert them all in one call
+        chunks = []
+        for tag, group in groupby(items, key=lambda item: 'error' if item[0] == 'error' else ()):
+            chunks.append(''.join(text for _, text in group))
+            chunks.append(tag)
+        
+        self.output.configure(state=tk.NORMAL)
+        self.output.insert(tk.END, *chunks)
+        
+        # Keep a rolling window; trim only past the slack so deletes are rare
+        line_count = int(self.output.index('end-1c').split('.')[0])
+        if line_count > MAX_OUTPUT_LINES + OUTPUT_TRIM_SLACK:
+            self.output.delete('1.0', f'end-{MAX_OUTPUT_LINES}l')
+        
+        self.output.see(tk.END)
+        self.output.configure(state=tk.DISABLED)
     
     def _append_output(self, text, tag=None):
         """Append text to output."""
@@ -247,6 +451,10 @@ class BottomPanel(ttk.Frame):
         self.output.see(tk.END)
         self.output.configure(state=tk.DISABLED)
     
+    def _save_history(self):
+        """Persist command history for the next session."""
+        save_command_history(self.command_history)
+    
     def _history_up(self, event=None):
         """Navigate command history up."""
         if self.command_history and self.history_index > 0:
@@ -274,13 +482,30 @@ class BottomPanel(ttk.Frame):
     
     def kill_process(self):
         """Kill the current running process."""
-        if self.process:
+        process = self.process
+        if process:
             try:
-                self.process.terminate()
+                if os.name == 'nt':
+                    # taskkill takes a while - run it off the Tk thread
+                    threading.Thread(target=self._kill_tree, args=(process.pid,), daemon=True).start()
+                else:
+                    process.terminate()
                 self._append_output('\n[Process terminated]\n\n', 'error')
             except Exception:
                 pass
     
+    @staticmethod
+    def _kill_tree(pid):
+        """Kill a process and its children (Windows)."""
+        try:
+            subprocess.run(
+                ['taskkill', '/T', '/F', '/PID', str(pid)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError:
+            pass
+    
     def focus_input(self):
         """Focus the input field."""
         self.input.focus_set()
@@ -305,36 +530,45 @@ class BottomPanel(ttk.Frame):
         count = len(errors)
         self.notebook.tab(1, text=f'Problems ({count})')
         
-        # Clear existing
-        for item in self.problems_tree.get_children():
-            self.problems_tree.delete(item)
+        # Same file, same problems - leave the rows alone
+        fingerprint = (filepath, lint_fingerprint(errors))
+        if fingerprint == self._problems_fingerprint:
+            return
+        self._problems_fingerprint = fingerprint
+        
+        # Clear existing (single Tcl call)
+        tree = self.problems_tree
+        tree.delete(*tree.get_children())
         
         # Add errors
-        filename = os.path.basename(filepath) if filepath else ''
+        filename = self._get_display_name(filepath)
+        insert = tree.insert
+        row_styles = _ROW_STYLES
+        default_style = row_styles['info']
         
         for error in errors:
-            severity_icon = '❌' if error.severity == 'error' else ('⚠' if error.severity == 'warning' else 'ℹ')
-            self.problems_tree.insert('', tk.END, values=(
-                severity_icon,
-                filename,
-                error.line,
-                f'[{error.code}] {error.message}' if error.code else error.message
-            ), tags=(error.severity,))
-        
-        # Configure tags
-        self.problems_tree.tag_configure('error', foreground='red')
-        self.problems_tree.tag_configure('warning', foreground='orange')
-        self.problems_tree.tag_configure('info', foreground='blue')
+            icon, tags = row_styles.get(error.severity, default_style)
+            message = f'[{error.code}] {error.message}' if error.code else error.message
+            insert('', 'end', values=(icon, filename, error.line, message), tags=tags)
         
         # Switch to problems tab if there are errors
         if errors:
             self.notebook.select(1)
     
+    def _get_display_name(self, filepath):
+        """Get the file name shown in the problems list (cached per path)."""
+        if not filepath:
+            return ''
+        if getattr(self, '_display_path', None) != filepath:
+            self._display_path = filepath
+            self._display_name = os.path.basename(filepath)
+        return self._display_name
+    
     def clear_problems(self):
         """Clear all problems."""
-        for item in self.problems_tree.get_children():
-            self.problems_tree.delete(item)
+        self.problems_tree.delete(*self.problems_tree.get_children())
         self.lint_errors = []
+        self._problems_fingerprint = None
         self.notebook.tab(1, text='Problems (0)')
     
     def _on_problem_click(self, event):
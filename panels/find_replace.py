@@ -3,9 +3,50 @@ Find and Replace dialog for NP2 editor.
 Provides search and replace functionality.
 """
 
+import re
 import tkinter as tk
+from functools import lru_cache
 from tkinter import ttk
 
+from editor.text_editor import LiteralPattern, advance_index
+from utils.timers import CoalescingTimer
+
+# Number of recent find queries kept compiled (shared by all dialogs)
+PATTERN_CACHE_SIZE = 256
+
+# Number of Highlight All results a dialog keeps for incremental updates
+MATCH_CACHE_SIZE = 32
+
+# Dialog width used for the first placement (two width=40 entries plus padding)
+ESTIMATED_DIALOG_WIDTH = 380
+
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_search_pattern(text, case_sensitive=False, whole_word=False, use_regex=False):
+    """
+    Build the regex for a find query.
+    
+    Cached here so repeated searches don't depend on re's module-level
+    cache, which many distinct patterns can flush.
+    
+    Args:
+        text: Text from the find entry
+        case_sensitive: Case sensitive search
+        whole_word: Match whole words only
+        use_regex: Treat text as a regular expression
+        
+    Returns:
+        Compiled re.Pattern, or a LiteralPattern for plain case-sensitive
+        text (raises re.error for an invalid regex)
+    """
+    if case_sensitive and not whole_word and not use_regex:
+        return LiteralPattern(text)
+    
+    body = text if use_regex else re.escape(text)
+    if whole_word:
+        body = rf'\b(?:{body})\b'
+    return re.compile(body, 0 if case_sensitive else re.IGNORECASE)
+
 
 class FindReplaceDialog:
     """Find and Replace dialog window."""
@@ -25,6 +66,14 @@ class FindReplaceDialog:
         self.replace_entry = None
         self.match_count = 0
         
+        # Clear stale highlights once typing pauses, not on every key
+        self._clear_timer = CoalescingTimer(parent, 150, self._do_clear)
+        
+        # Highlight All results per (text, case, whole word, regex), reused
+        # while the query is extended or shortened
+        self._match_cache = {}
+        self._highlighted_key = None
+        
         # Options
         self.case_sensitive = tk.BooleanVar(value=False)
         self.whole_word = tk.BooleanVar(value=False)
@@ -60,7 +109,8 @@ class FindReplaceDialog:
         find_frame.pack(fill=tk.X, pady=(0, 5))
         
         ttk.Label(find_frame, text='🔍 Find:', width=10).pack(side=tk.LEFT)
-        self.find_entry = ttk.Entry(find_frame, width=40)
+        self._find_var = tk.StringVar(self.dialog)
+        self.find_entry = ttk.Entry(find_frame, textvariable=self._find_var, width=40)
         self.find_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 0))
         
         # Replace row (if in replace mode)
@@ -142,7 +192,6 @@ class FindReplaceDialog:
         # Bind events
         self.find_entry.bind('<Return>', lambda e: self._find_next())
         self.find_entry.bind('<Escape>', lambda e: self._close())
-        self.find_entry.bind('<KeyRelease>', self._on_find_change)
         
         if replace_mode and self.replace_entry:
             self.replace_entry.bind('<Return>', lambda e: self._replace())
@@ -159,6 +208,9 @@ class FindReplaceDialog:
         except tk.TclError:
             pass
         
+        # Fires only when the text actually changes (not for arrows, Shift, Return)
+        self._find_var.trace_add('write', self._on_find_change)
+        
         # Focus find entry
         self.find_entry.focus_set()
         
@@ -167,41 +219,135 @@ class FindReplaceDialog:
     
     def _position_dialog(self):
         """Position dialog to the right of parent."""
-        self.dialog.update_idletasks()
-        
+        # Place it right away from an estimated width instead of flushing
+        # the whole idle queue; refine once Tk has computed the real size
+        self._place_dialog(ESTIMATED_DIALOG_WIDTH)
+        self.dialog.after_idle(self._refine_position)
+    
+    def _refine_position(self):
+        """Re-place the dialog using its requested width."""
+        if self.dialog and self.dialog.winfo_exists():
+            self._place_dialog(self.dialog.winfo_reqwidth())
+    
+    def _place_dialog(self, dialog_width):
+        """Move the dialog near the parent's top-right corner."""
         parent_x = self.parent.winfo_x()
         parent_y = self.parent.winfo_y()
         parent_width = self.parent.winfo_width()
         
-        dialog_width = self.dialog.winfo_width()
-        
         x = parent_x + parent_width - dialog_width - 50
         y = parent_y + 100
         
         self.dialog.geometry(f'+{x}+{y}')
     
-    def _on_find_change(self, event=None):
-        """Handle changes to find text."""
-        # Ignore Return key release (fixes highlight disappearing)
-        if event and event.keysym in ('Return', 'KP_Enter'):
+    def _on_find_change(self, *args):
+        """Handle changes to find text (StringVar write trace)."""
+        self._clear_timer.schedule()
+    
+    def _do_clear(self):
+        """Clear highlights after the find text changed."""
+        if not self.dialog:
             return
-            
-        # Clear highlights when text changes
         self.editor.clear_search_highlights()
         self.status_label.configure(text='')
+        self._update_highlighted_matches()
+    
+    def _update_highlighted_matches(self):
+        """Carry Highlight All results over to the edited find text without a rescan."""
+        key = self._highlighted_key
+        if key is None:
+            return
+        self._highlighted_key = None
+        
+        old_text = key[0]
+        new_text = self.find_entry.get()
+        new_key = self._query_key(new_text)
+        _, case_sensitive, whole_word, use_regex = new_key
+        old_matches = self._match_cache.get(key, [])
+        
+        if not new_text or '\n' in new_text:
+            candidates = []
+        elif new_key in self._match_cache and not use_regex:
+            # Backspace (or retype) to a query seen before
+            candidates = self._match_cache[new_key]
+        elif (new_text.startswith(old_text) and new_key[1:] == key[1:] and not use_regex
+                and not whole_word and len(old_matches) < self.editor.MAX_OCCURRENCES):
+            # Typed more: every new match starts where an old one did
+            # (not true for regexes, whole words, or a result cut off at the limit)
+            candidates = old_matches
+        else:
+            # Needs a fresh Highlight All
+            candidates = []
+        
+        if not candidates:
+            self.editor.show_occurrences(new_text, [])
+            return
+        
+        # Re-check candidates against the buffer (it may have been edited)
+        pattern = compile_search_pattern(new_text, case_sensitive, whole_word, False)
+        text = self.editor.text
+        ranges = []
+        for start, _ in candidates:
+            # One character of context on each side for \b
+            lead = 0 if start == '1.0' else 1
+            # (a column past the line end clamps to it - the newline is a boundary anyway)
+            window = text.get(f'{start}-{lead}c', advance_index(start, len(new_text) + 1, new_text))
+            if isinstance(pattern, LiteralPattern):
+                matched = window.startswith(new_text, lead)
+            else:
+                match = pattern.match(window, lead)
+                matched = match is not None and match.end() == lead + len(new_text)
+            if matched:
+                ranges.append((start, advance_index(start, len(new_text), new_text)))
+        
+        self._remember_matches(new_key, ranges)
+        self.match_count = self.editor.show_occurrences(new_text, ranges)
+        self.status_label.configure(text=f'{self.match_count} occurrences highlighted')
+    
+    def _remember_matches(self, key, ranges):
+        """Cache Highlight All results for a query."""
+        self._match_cache.pop(key, None)
+        self._match_cache[key] = ranges
+        if len(self._match_cache) > MATCH_CACHE_SIZE:
+            del self._match_cache[next(iter(self._match_cache))]
+        self._highlighted_key = key
+    
+    def _flush_pending_clear(self):
+        """Run a pending clear now so it cannot wipe the next search's highlight."""
+        if self._clear_timer.is_pending():
+            self._clear_timer.cancel()
+            self._do_clear()
+    
+    def _query_key(self, find_text):
+        """Get the cache key for the find text and current options."""
+        return (find_text, self.case_sensitive.get(), self.whole_word.get(), self.use_regex.get())
+    
+    def _build_pattern(self, find_text):
+        """
+        Get the compiled pattern for the find text and current options.
+        
+        Returns:
+            Compiled pattern (see compile_search_pattern), or None if the regex is invalid
+        """
+        try:
+            return compile_search_pattern(*self._query_key(find_text))
+        except re.error as e:
+            self.status_label.configure(text=f'Invalid regex: {e}')
+            return None
     
     def _find_next(self):
         """Find next occurrence."""
+        self._flush_pending_clear()
+        
         find_text = self.find_entry.get()
         if not find_text:
             return
         
-        pos = self.editor.find_text(
-            find_text,
-            case_sensitive=self.case_sensitive.get(),
-            whole_word=self.whole_word.get(),
-            regex=self.use_regex.get()
-        )
+        pattern = self._build_pattern(find_text)
+        if pattern is None:
+            return
+        
+        pos = self.editor.find_text(find_text, pattern=pattern)
         
         if pos:
             self.status_label.configure(text=f'Found at line {pos.split(".")[0]}')
@@ -210,57 +356,47 @@ class FindReplaceDialog:
     
     def _find_previous(self):
         """Find previous occurrence."""
+        self._flush_pending_clear()
+        
         find_text = self.find_entry.get()
         if not find_text:
             return
         
-        # Get current position
-        current = self.editor.text.index('insert')
-        
-        # Search backwards
-        pos = self.editor.text.search(
-            find_text,
-            current,
-            backwards=True,
-            stopindex='1.0',
-            nocase=not self.case_sensitive.get(),
-            regexp=self.use_regex.get()
-        )
+        pattern = self._build_pattern(find_text)
+        if pattern is None:
+            return
         
-        # Wrap around
-        if not pos:
-            pos = self.editor.text.search(
-                find_text,
-                'end',
-                backwards=True,
-                stopindex=current,
-                nocase=not self.case_sensitive.get(),
-                regexp=self.use_regex.get()
-            )
+        pos = self.editor.find_text(find_text, pattern=pattern, backwards=True)
         
         if pos:
-            end = f'{pos}+{len(find_text)}c'
-            self.editor.text.tag_remove('search', '1.0', 'end')
-            self.editor.text.tag_add('search', pos, end)
-            self.editor.text.mark_set('insert', pos)
-            self.editor.text.see(pos)
-            # self.editor.text.tag_add('sel', pos, end)  # S01 Fix: Don't select
             self.status_label.configure(text=f'Found at line {pos.split(".")[0]}')
         else:
             self.status_label.configure(text='No match found')
     
     def _highlight_all(self):
         """Highlight all occurrences."""
+        self._flush_pending_clear()
+        
         find_text = self.find_entry.get()
         if not find_text:
             return
         
-        count = self.editor.highlight_all_occurrences(find_text)
+        pattern = self._build_pattern(find_text)
+        if pattern is None:
+            return
+        
+        count = self.editor.highlight_all_occurrences(find_text, pattern=pattern)
         self.match_count = count
+        
+        # A fresh scan replaces everything cached from the old buffer state
+        self._match_cache.clear()
+        self._remember_matches(self._query_key(find_text), self.editor.occurrence_positions)
         self.status_label.configure(text=f'{count} occurrences highlighted')
     
     def _replace(self):
         """Replace current occurrence."""
+        self._flush_pending_clear()
+        
         if not self.replace_entry:
             return
         
@@ -270,10 +406,15 @@ class FindReplaceDialog:
         if not find_text:
             return
         
+        pattern = self._build_pattern(find_text)
+        if pattern is None:
+            return
+        
         replaced = self.editor.replace_text(
             find_text,
             replace_text,
-            case_sensitive=self.case_sensitive.get()
+            case_sensitive=self.case_sensitive.get(),
+            pattern=pattern
         )
         
         if replaced:
@@ -285,6 +426,8 @@ class FindReplaceDialog:
     
     def _replace_all(self):
         """Replace all occurrences."""
+        self._flush_pending_clear()
+        
         if not self.replace_entry:
             return
         
@@ -294,10 +437,15 @@ class FindReplaceDialog:
         if not find_text:
             return
         
+        pattern = self._build_pattern(find_text)
+        if pattern is None:
+            return
+        
         count = self.editor.replace_all(
             find_text,
             replace_text,
-            case_sensitive=self.case_sensitive.get()
+            case_sensitive=self.case_sensitive.get(),
+            pattern=pattern
         )
         
         self.status_label.configure(text=f'Replaced {count} occurrences')
@@ -305,6 +453,7 @@ class FindReplaceDialog:
     def _close(self):
         """Close the dialog."""
         if self.dialog:
+            self._clear_timer.cancel()
             self.editor.clear_search_highlights()
             self.dialog.destroy()
             self.dialog = None
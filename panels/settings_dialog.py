@@ -5,6 +5,9 @@ Settings dialog for NP2 editor.
 import tkinter as tk
 from tkinter import ttk
 
+DIALOG_WIDTH = 400
+DIALOG_HEIGHT = 350
+
 class SettingsDialog(tk.Toplevel):
     """Dialog for editing application settings."""
     
@@ -21,7 +24,6 @@ class SettingsDialog(tk.Toplevel):
         self.settings = settings_manager.settings
         
         self.title("Preferences")
-        self.geometry("400x350")
         self.resizable(False, False)
         self.transient(parent)
         self.grab_set()
@@ -31,11 +33,11 @@ class SettingsDialog(tk.Toplevel):
         self._setup_ui()
         self._load_values()
         
-        # Center dialog
-        self.update_idletasks()
-        x = parent.winfo_x() + (parent.winfo_width() // 2) - (self.winfo_width() // 2)
-        y = parent.winfo_y() + (parent.winfo_height() // 2) - (self.winfo_height() // 2)
-        self.geometry(f"+{x}+{y}")
+        # Center dialog; the size is fixed, so no idle flush is needed to measure it
+        w, h = DIALOG_WIDTH, DIALOG_HEIGHT
+        x = parent.winfo_x() + (parent.winfo_width() // 2) - (w // 2)
+        y = parent.winfo_y() + (parent.winfo_height() // 2) - (h // 2)
+        self.geometry(f"{w}x{h}+{x}+{y}")
         
     def _setup_ui(self):
         """Set up the UI components."""
@@ -101,9 +103,11 @@ class SettingsDialog(tk.Toplevel):
         except ValueError:
             interval = 30
             
-        self.settings_manager.set('autosave_mode', self.autosave_mode_var.get())
-        self.settings_manager.set('autosave_interval', interval)
-        self.settings_manager.set('terminal_follow', self.term_follow_var.get())
+        self.settings_manager.update({
+            'autosave_mode': self.autosave_mode_var.get(),
+            'autosave_interval': interval,
+            'terminal_follow': self.term_follow_var.get(),
+        })
         
         self.result = True
         self.destroy()
@@ -3,13 +3,22 @@ Integrated terminal panel for NP2 editor.
 Provides a command-line interface within the editor.
 """
 
+import atexit
 import os
 import subprocess
 import threading
-import queue
+from collections import deque
+from itertools import groupby
 import tkinter as tk
 from tkinter import ttk
 
+from utils.file_utils import load_command_history, output_decoder, save_command_history
+
+
+# Terminal output keeps at most this many lines (plus slack before trimming)
+MAX_OUTPUT_LINES = 5000
+OUTPUT_TRIM_SLACK = 500
+
 
 class TerminalPanel(ttk.Frame):
     """Integrated terminal panel."""
@@ -24,13 +33,15 @@ class TerminalPanel(ttk.Frame):
         super().__init__(parent, **kwargs)
         
         self.process = None
-        self.output_queue = queue.Queue()
+        # deque append/popleft are atomic - no lock per message
+        self.output_queue = deque()
         self.working_dir = os.getcwd()
-        self.command_history = []
-        self.history_index = 0
+        self.command_history = load_command_history()
+        self.history_index = len(self.command_history)
+        
+        atexit.register(self._save_history)
         
         self._setup_ui()
-        self._start_update_loop()
     
     def _setup_ui(self):
         """Set up the UI."""
@@ -73,6 +84,9 @@ class TerminalPanel(ttk.Frame):
         self.output.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        # Reader threads wake the UI with this event instead of polling
+        self.output.bind('<<TerminalOutput>>', self._drain_queue)
+        
         # Configure output tags
         self.output.tag_configure('prompt', foreground='blue')
         self.output.tag_configure('command', foreground='#000080')
@@ -95,8 +109,7 @@ class TerminalPanel(ttk.Frame):
         self.input.bind('<Down>', self._history_down)
         
         # Welcome message
-        self._append_output('NP2 Terminal - PowerShell\n', 'prompt')
-        self._append_output(f'Working directory: {self.working_dir}\n\n', 'prompt')
+        self._append_output(f'NP2 Terminal - PowerShell\nWorking directory: {self.working_dir}\n\n', 'prompt')
     
     def _on_enter(self, event=None):
         """Handle Enter key to execute command."""
@@ -156,24 +169,33 @@ class TerminalPanel(ttk.Frame):
                     stdout=subprocess.PIPE,
                     stderr=subprocess.STDOUT,
                     shell=True,
-                    text=True,
-                    bufsize=1,
+                    bufsize=0,
                     cwd=self.working_dir,
                 )
                 
-                # Read output
-                for line in self.process.stdout:
-                    self.output_queue.put(('output', line))
+                # Read output in 64 KiB blocks instead of line by line
+                fd = self.process.stdout.fileno()
+                decoder = output_decoder()
+                while True:
+                    data = os.read(fd, 65536)
+                    if not data:
+                        break
+                    text = decoder.decode(data)
+                    if text:
+                        self._post_output('output', text)
+                text = decoder.decode(b'', final=True)
+                if text:
+                    self._post_output('output', text)
                 
                 self.process.wait()
                 
                 if self.process.returncode != 0:
-                    self.output_queue.put(('error', f'Exit code: {self.process.returncode}\n'))
+                    self._post_output('error', f'Exit code: {self.process.returncode}\n')
                 
-                self.output_queue.put(('done', '\n'))
+                self._post_output('done', '\n')
                 
             except Exception as e:
-                self.output_queue.put(('error', f'Error: {e}\n\n'))
+                self._post_output('error', f'Error: {e}\n\n')
             finally:
                 self.process = None
         
@@ -181,22 +203,43 @@ class TerminalPanel(ttk.Frame):
         thread = threading.Thread(target=run, daemon=True)
         thread.start()
     
-    def _start_update_loop(self):
-        """Start the output update loop."""
+    def _post_output(self, msg_type, text):
+        """Queue output from a reader thread and wake the UI to drain it."""
+        self.output_queue.append((msg_type, text))
+        try:
+            self.output.event_generate('<<TerminalOutput>>', when='tail')
+        except (tk.TclError, RuntimeError):
+            pass  # Panel destroyed or main loop gone
+    
+    def _drain_queue(self, event=None):
+        """Append all queued output (runs on the Tk main thread)."""
+        items = []
+        popleft = self.output_queue.popleft
         try:
             while True:
-                msg_type, text = self.output_queue.get_nowait()
-                
-                if msg_type == 'error':
-                    self._append_output(text, 'error')
-                else:
-                    self._append_output(text)
-                    
-        except queue.Empty:
+                items.append(popleft())
+        except IndexError:
             pass
         
-        # Schedule next update
-        self.after(50, self._start_update_loop)
+        if not items:
+            return
+        
+        # Join runs with the same tag and insert them all in one call
+        chunks = []
+        for tag, group in groupby(items, key=lambda item: 'error' if item[0] == 'error' else ()):
+            chunks.append(''.join(text for _, text in group))
+            chunks.append(tag)
+        
+        self.output.configure(state=tk.NORMAL)
+        self.output.insert(tk.END, *chunks)
+        
+        # Keep a rolling window; trim only past the slack so deletes are rare
+        line_count = int(self.output.index('end-1c').split('.')[0])
+        if line_count > MAX_OUTPUT_LINES + OUTPUT_TRIM_SLACK:
+            self.output.delete('1.0', f'end-{MAX_OUTPUT_LINES}l')
+        
+        self.output.see(tk.END)
+        self.output.configure(state=tk.DISABLED)
     
     def _append_output(self, text, tag=None):
         """Append text to output."""
@@ -210,6 +253,10 @@ class TerminalPanel(ttk.Frame):
         self.output.see(tk.END)
         self.output.configure(state=tk.DISABLED)
     
+    def _save_history(self):
+        """Persist command history for the next session."""
+        save_command_history(self.command_history)
+    
     def _history_up(self, event=None):
         """Navigate command history up."""
         if self.command_history and self.history_index > 0:
@@ -4,8 +4,109 @@ Provides a tree view for navigating folder contents.
 """
 
 import os
+import sys
+import threading
 import tkinter as tk
-from tkinter import ttk, filedialog
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import ttk
+
+# Directory listings kept for re-expanding folders
+DIR_CACHE_SIZE = 256
+
+# Rows inserted per folder at a time; the rest load as the user scrolls
+LOAD_CHUNK_SIZE = 500
+
+# The first screenful is inserted at once; the rest of the first chunk
+# follows in idle callbacks of this many rows
+IDLE_CHUNK_SIZE = 200
+DEFAULT_ROW_HEIGHT = 20
+
+# Executor.shutdown(cancel_futures=...) needs Python 3.9+; older versions
+# let queued scans run to completion
+_SHUTDOWN_CANCEL = {'cancel_futures': True} if sys.version_info >= (3, 9) else {}
+
+# File-type icons by lowercase extension
+FILE_ICONS = {
+    '.py': '🐍',
+    '.js': '📜',
+    '.ts': '📘',
+    '.html': '🌐',
+    '.css': '🎨',
+    '.json': '📋',
+    '.xml': '📄',
+    '.md': '📝',
+    '.txt': '📄',
+    '.yaml': '⚙',
+    '.yml': '⚙',
+    '.toml': '⚙',
+    '.ini': '⚙',
+    '.cfg': '⚙',
+    '.sh': '⌨',
+    '.bat': '⌨',
+    '.ps1': '⌨',
+    '.c': '©',
+    '.cpp': '©',
+    '.h': '©',
+    '.java': '☕',
+    '.go': '🔷',
+    '.rs': '🦀',
+    '.rb': '💎',
+    '.php': '🐘',
+    '.sql': '🗃',
+    '.png': '🖼',
+    '.jpg': '🖼',
+    '.jpeg': '🖼',
+    '.gif': '🖼',
+    '.svg': '🖼',
+    '.ico': '🖼',
+}
+DEFAULT_FILE_ICON = '📄'
+FOLDER_ICON = '📁'
+
+# What the tree knows about a node, recorded when it is inserted
+NodeInfo = namedtuple('NodeInfo', 'path is_dir')
+
+
+def get_file_icon(filename):
+    """Get icon for file type."""
+    # Names never contain a separator here, so a plain rfind matches splitext
+    dot = filename.rfind('.')
+    if dot <= 0:
+        return DEFAULT_FILE_ICON
+    return FILE_ICONS.get(filename[dot:].lower(), DEFAULT_FILE_ICON)
+
+
+def scan_directory(path, cached_mtime_ns=None):
+    """
+    Get the sorted visible entries of a folder.
+    
+    Makes no Tk calls, so it can run on a worker thread.
+    
+    Args:
+        path: Folder path
+        cached_mtime_ns: mtime of an existing listing, or None
+        
+    Returns:
+        Tuple of (mtime_ns, rows) where rows is a list of (is_dir, path, label)
+        tuples, folders first, or None if the folder still has cached_mtime_ns
+    """
+    mtime_ns = os.stat(path).st_mtime_ns
+    if mtime_ns == cached_mtime_ns:
+        return mtime_ns, None
+    
+    # One directory read; DirEntry carries the file type, so only
+    # symlinks cost an extra stat
+    with os.scandir(path) as it:
+        # Skip hidden files/folders; the tuples are their own sort key
+        # (folders first, then case-insensitive name)
+        entries = [(not entry.is_dir(), entry.name.lower(), entry.name, entry.path)
+                   for entry in it if not entry.name.startswith('.')]
+    entries.sort()
+    
+    rows = [(not is_file, item_path, f'{get_file_icon(name) if is_file else FOLDER_ICON} {name}')
+            for is_file, _, name, item_path in entries]
+    return mtime_ns, rows
 
 
 class WorkspacePanel(ttk.Frame):
@@ -25,7 +126,16 @@ class WorkspacePanel(ttk.Frame):
         self.on_file_open = on_file_open
         self.on_folder_select = on_folder_select
         self.current_folder = None
-        self.nodes = {}  # node_id -> path
+        self.nodes = {}  # node_id -> NodeInfo
+        self._dir_cache = OrderedDict()  # path -> (mtime_ns, [(is_dir, path, label)])
+        self._pending_rows = {}  # 'load more' node_id -> (parent_id, rows, offset)
+        self._load_more_job = None
+        
+        # Folder scans run here so slow disks don't freeze the UI
+        self._io_pool = ThreadPoolExecutor(max_workers=2)
+        self._loading = {}  # parent_id -> transient 'loading' node_id
+        # Finished scans waiting for the Tk thread (deque append/popleft are atomic)
+        self._scan_results = deque()
         
         self._setup_ui()
     
@@ -50,7 +160,7 @@ class WorkspacePanel(ttk.Frame):
         self.tree = ttk.Treeview(tree_frame, selectmode='browse', show='tree')
         
         scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.configure(yscrollcommand=lambda first, last: self._on_tree_scroll(scrollbar, first, last))
         
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
@@ -58,6 +168,8 @@ class WorkspacePanel(ttk.Frame):
         # Bind events
         self.tree.bind('<Double-1>', self._on_double_click)
         self.tree.bind('<<TreeviewOpen>>', self._on_expand)
+        # Pool threads wake the UI with this event; only the Tk thread touches the tree
+        self.tree.bind('<<ScanDone>>', self._drain_scan_results)
         self.tree.bind('<<TreeviewSelect>>', self._on_select)
         self.tree.bind('<Button-3>', self._on_right_click)
     
@@ -71,10 +183,10 @@ class WorkspacePanel(ttk.Frame):
             return
             
         node_id = selection[0]
-        path = self.nodes.get(node_id)
+        info = self.nodes.get(node_id)
         
-        if path and os.path.isdir(path):
-            self.on_folder_select(path)
+        if info and info.is_dir:
+            self.on_folder_select(info.path)
     
     def open_folder(self, folder_path=None):
         """
@@ -84,6 +196,8 @@ class WorkspacePanel(ttk.Frame):
             folder_path: Path to folder, or None to show dialog
         """
         if folder_path is None:
+            # Imported on first use - the folder is usually restored or passed in
+            from tkinter import filedialog
             folder_path = filedialog.askdirectory(title='Open Folder')
         
         if not folder_path or not os.path.isdir(folder_path):
@@ -94,11 +208,13 @@ class WorkspacePanel(ttk.Frame):
         # Clear tree
         self.tree.delete(*self.tree.get_children())
         self.nodes.clear()
+        self._pending_rows.clear()
+        self._loading.clear()
         
         # Add root node
         folder_name = os.path.basename(folder_path) or folder_path
         root_id = self.tree.insert('', 'end', text=f'📁 {folder_name}', open=True)
-        self.nodes[root_id] = folder_path
+        self.nodes[root_id] = NodeInfo(folder_path, True)
         
         # Load contents
         self._load_children(root_id, folder_path)
@@ -113,89 +229,164 @@ class WorkspacePanel(ttk.Frame):
         """
         Load children of a folder.
         
+        The folder is scanned on a worker thread; a transient node shows
+        progress until the rows arrive.
+        
         Args:
             parent_id: Parent tree node ID
             path: Folder path
         """
+        if parent_id in self._loading:
+            return
+        self._loading[parent_id] = self.tree.insert(parent_id, 'end', text='⏳ Loading…')
+        
+        cached = self._dir_cache.get(path)
+        future = self._io_pool.submit(scan_directory, path, cached[0] if cached else None)
+        future.add_done_callback(
+            lambda f: self._post_scan_result((parent_id, path, cached, f))
+        )
+    
+    def _post_scan_result(self, result):
+        """Queue a finished scan from a pool thread and wake the UI to apply it."""
+        self._scan_results.append(result)
         try:
-            items = os.listdir(path)
-            items.sort(key=lambda x: (not os.path.isdir(os.path.join(path, x)), x.lower()))
-            
-            for item in items:
-                # Skip hidden files/folders
-                if item.startswith('.'):
-                    continue
-                
-                item_path = os.path.join(path, item)
-                
-                if os.path.isdir(item_path):
-                    # Folder
-                    node_id = self.tree.insert(parent_id, 'end', text=f'📁 {item}')
-                    self.nodes[node_id] = item_path
-                    
-                    # Add placeholder for expansion
-                    if self._has_children(item_path):
-                        self.tree.insert(node_id, 'end', text='Loading...')
-                else:
-                    # File
-                    icon = self._get_file_icon(item)
-                    node_id = self.tree.insert(parent_id, 'end', text=f'{icon} {item}')
-                    self.nodes[node_id] = item_path
+            self.tree.event_generate('<<ScanDone>>', when='tail')
+        except (tk.TclError, RuntimeError):
+            pass  # Panel destroyed or main loop gone
+    
+    def _drain_scan_results(self, event=None):
+        """Apply all finished scans (runs on the Tk main thread)."""
+        popleft = self._scan_results.popleft
+        while True:
+            try:
+                result = popleft()
+            except IndexError:
+                return
+            self._apply_children(*result)
+    
+    def _apply_children(self, parent_id, path, cached, future):
+        """
+        Insert the result of a background folder scan.
+        
+        Listings are cached and reused while the folder's mtime is unchanged.
+        
+        Args:
+            parent_id: Parent tree node ID
+            path: Folder path
+            cached: (mtime_ns, rows) cache entry the scan was checked against, or None
+            future: Completed scan_directory future
+        """
+        loading_id = self._loading.pop(parent_id, None)
+        if not self.tree.exists(parent_id):
+            # Tree was reset while scanning
+            return
+        if loading_id and self.tree.exists(loading_id):
+            self.tree.delete(loading_id)
+        
+        try:
+            mtime_ns, rows = future.result()
         except PermissionError:
             self.tree.insert(parent_id, 'end', text='⚠ Permission denied')
+            return
         except Exception as e:
             self.tree.insert(parent_id, 'end', text=f'⚠ Error: {str(e)[:30]}')
+            return
+        
+        if rows is None:
+            rows = cached[1]
+        self._dir_cache[path] = (mtime_ns, rows)
+        self._dir_cache.move_to_end(path)
+        if len(self._dir_cache) > DIR_CACHE_SIZE:
+            self._dir_cache.popitem(last=False)
+        
+        if not rows:
+            self.tree.insert(parent_id, 'end', text='(empty)')
+            return
+        
+        first = self._visible_row_count()
+        more_id = self._insert_rows(parent_id, rows, 0, first)
+        if more_id:
+            self.after_idle(self._continue_load, more_id, LOAD_CHUNK_SIZE - first)
     
-    def _has_children(self, path):
-        """Check if folder has visible children."""
+    def _visible_row_count(self):
+        """Estimate how many rows fit in the tree's viewport."""
         try:
-            for item in os.listdir(path):
-                if not item.startswith('.'):
-                    return True
-        except Exception:
-            pass
-        return False
+            row_height = int(ttk.Style(self).lookup('Treeview', 'rowheight') or DEFAULT_ROW_HEIGHT)
+        except (tk.TclError, ValueError):
+            row_height = DEFAULT_ROW_HEIGHT
+        return max(self.tree.winfo_height() // row_height, 40)
     
-    def _get_file_icon(self, filename):
-        """Get icon for file type."""
-        ext = os.path.splitext(filename)[1].lower()
-        
-        icon_map = {
-            '.py': '🐍',
-            '.js': '📜',
-            '.ts': '📘',
-            '.html': '🌐',
-            '.css': '🎨',
-            '.json': '📋',
-            '.xml': '📄',
-            '.md': '📝',
-            '.txt': '📄',
-            '.yaml': '⚙',
-            '.yml': '⚙',
-            '.toml': '⚙',
-            '.ini': '⚙',
-            '.cfg': '⚙',
-            '.sh': '⌨',
-            '.bat': '⌨',
-            '.ps1': '⌨',
-            '.c': '©',
-            '.cpp': '©',
-            '.h': '©',
-            '.java': '☕',
-            '.go': '🔷',
-            '.rs': '🦀',
-            '.rb': '💎',
-            '.php': '🐘',
-            '.sql': '🗃',
-            '.png': '🖼',
-            '.jpg': '🖼',
-            '.jpeg': '🖼',
-            '.gif': '🖼',
-            '.svg': '🖼',
-            '.ico': '🖼',
-        }
-        
-        return icon_map.get(ext, '📄')
+    def _insert_rows(self, parent_id, rows, offset, count=LOAD_CHUNK_SIZE):
+        """
+        Insert the next chunk of a folder listing.
+        
+        When rows remain after the chunk, a 'load more' node is added and
+        filled in once it scrolls into view.
+        
+        Args:
+            parent_id: Parent tree node ID
+            rows: Listing from scan_directory
+            offset: Index of the first row to insert
+            count: Maximum number of rows to insert
+            
+        Returns:
+            ID of the 'load more' node, or None if the folder is complete
+        """
+        end = offset + count
+        
+        # Rows come pre-sorted and labelled; issue the inserts as raw Tcl
+        # calls so each row skips Treeview.insert's option formatting
+        call = self.tree.tk.call
+        widget = str(self.tree)
+        nodes = self.nodes
+        for is_dir, item_path, text in rows[offset:end]:
+            node_id = call(widget, 'insert', parent_id, 'end', '-text', text)
+            nodes[node_id] = NodeInfo(item_path, is_dir)
+            if is_dir:
+                # Add placeholder for expansion; contents are read on expand
+                call(widget, 'insert', node_id, 'end', '-text', 'Loading...')
+        
+        remaining = len(rows) - end
+        if remaining > 0:
+            more_id = self.tree.insert(parent_id, 'end', text=f'▼ {remaining} more (scroll to load)')
+            self._pending_rows[more_id] = (parent_id, rows, end)
+            return more_id
+        return None
+    
+    def _load_more(self, more_id, count=LOAD_CHUNK_SIZE):
+        """Replace a 'load more' node with the next chunk of its folder."""
+        parent_id, rows, offset = self._pending_rows.pop(more_id)
+        self.tree.delete(more_id)
+        return self._insert_rows(parent_id, rows, offset, count)
+    
+    def _continue_load(self, more_id, budget):
+        """Keep filling a folder's first chunk between idle cycles."""
+        if budget <= 0 or more_id not in self._pending_rows:
+            # Finished, or already loaded by scrolling or a refresh
+            return
+        if not self.tree.exists(more_id):
+            del self._pending_rows[more_id]
+            return
+        
+        count = min(IDLE_CHUNK_SIZE, budget)
+        more_id = self._load_more(more_id, count)
+        if more_id:
+            self.after_idle(self._continue_load, more_id, budget - count)
+    
+    def _on_tree_scroll(self, scrollbar, first, last):
+        """Update the scrollbar and check for 'load more' nodes in view."""
+        scrollbar.set(first, last)
+        if self._pending_rows and self._load_more_job is None:
+            self._load_more_job = self.after_idle(self._load_visible_rows)
+    
+    def _load_visible_rows(self):
+        """Load the next chunk for every 'load more' node currently on screen."""
+        self._load_more_job = None
+        for more_id in list(self._pending_rows):
+            if not self.tree.exists(more_id):
+                del self._pending_rows[more_id]
+            elif self.tree.bbox(more_id):
+                self._load_more(more_id)
     
     def _on_double_click(self, event):
         """Handle double-click to open file."""
@@ -204,11 +395,15 @@ class WorkspacePanel(ttk.Frame):
             return
         
         node_id = selection[0]
-        path = self.nodes.get(node_id)
+        if node_id in self._pending_rows:
+            self._load_more(node_id)
+            return
+        
+        info = self.nodes.get(node_id)
         
-        if path and os.path.isfile(path):
+        if info and not info.is_dir:
             if self.on_file_open:
-                self.on_file_open(path)
+                self.on_file_open(info.path)
     
     def _on_expand(self, event):
         """Handle tree node expansion."""
@@ -217,9 +412,9 @@ class WorkspacePanel(ttk.Frame):
             return
         
         node_id = selection[0]
-        path = self.nodes.get(node_id)
+        info = self.nodes.get(node_id)
         
-        if path and os.path.isdir(path):
+        if info and info.is_dir:
             # Check if this is a lazy load
             children = self.tree.get_children(node_id)
             if len(children) == 1:
@@ -227,7 +422,7 @@ class WorkspacePanel(ttk.Frame):
                 if first_child['text'] == 'Loading...':
                     # Remove placeholder and load real children
                     self.tree.delete(children[0])
-                    self._load_children(node_id, path)
+                    self._load_children(node_id, info.path)
     
     def _on_right_click(self, event):
         """Handle right-click for context menu."""
@@ -235,12 +430,13 @@ class WorkspacePanel(ttk.Frame):
         item = self.tree.identify_row(event.y)
         if item:
             self.tree.selection_set(item)
-            path = self.nodes.get(item)
+            info = self.nodes.get(item)
             
-            if path:
+            if info:
+                path = info.path
                 menu = tk.Menu(self, tearoff=0)
                 
-                if os.path.isfile(path):
+                if not info.is_dir:
                     menu.add_command(
                         label='📄 Open', 
                         command=lambda: self.on_file_open(path) if self.on_file_open else None
@@ -249,7 +445,7 @@ class WorkspacePanel(ttk.Frame):
                 
                 menu.add_command(
                     label='📁 Open in Explorer', 
-                    command=lambda: self._open_in_explorer(path)
+                    command=lambda: self._open_in_explorer(path, info.is_dir)
                 )
                 menu.add_command(
                     label='📋 Copy Path', 
@@ -263,14 +459,27 @@ class WorkspacePanel(ttk.Frame):
                 
                 menu.tk_popup(event.x_root, event.y_root)
     
-    def _open_in_explorer(self, path):
+    def _open_in_explorer(self, path, is_dir):
         """Open path in file explorer."""
-        import subprocess
-        
-        if os.path.isfile(path):
+        if not is_dir:
             path = os.path.dirname(path)
         
-        subprocess.run(['explorer', path])
+        # Launch off the UI thread so a slow shell can't stall the tree
+        threading.Thread(target=self._launch_file_manager, args=(path,), daemon=True).start()
+    
+    @staticmethod
+    def _launch_file_manager(path):
+        """Show a folder in the platform's file manager."""
+        try:
+            if sys.platform == 'win32':
+                # ShellExecute reuses the running Explorer instead of spawning one
+                os.startfile(path)
+            else:
+                import subprocess
+                opener = 'open' if sys.platform == 'darwin' else 'xdg-open'
+                subprocess.run([opener, path])
+        except Exception:
+            pass
     
     def _copy_path(self, path):
         """Copy path to clipboard."""
@@ -280,8 +489,14 @@ class WorkspacePanel(ttk.Frame):
     def _refresh_current(self):
         """Refresh the current folder."""
         if self.current_folder:
+            self._dir_cache.clear()
             self.open_folder(self.current_folder)
     
     def refresh(self):
         """Refresh the workspace."""
         self._refresh_current()
+    
+    def destroy(self):
+        """Stop background scans and destroy the panel."""
+        self._io_pool.shutdown(wait=False, **_SHUTDOWN_CANCEL)
+        super().destroy()
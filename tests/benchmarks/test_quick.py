@@ -7,13 +7,17 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from editor.text_editor import TextEditor
 
+# Synthetic content used when the sample file isn't available; built once at
+# import so generating it never overlaps the timed run
+FALLBACK_CONTENT = '{' + ', '.join('"key_%d"' % i for i in range(1000)) + '}'
+
 def load_file():
     # Load actual user file
     try:
         with open(r'c:\Users\ben\Dev\np2\test_files\model (1).bbmodel', 'r', encoding='utf-8') as f:
             content = f.read()
     except:
-        content = '{"key_' + '", "key_'.join(str(i) for i in range(1000)) + '"}'
+        content = FALLBACK_CONTENT
     
     editor.set_content(content, filepath='test.bbmodel')
     print(f"Loaded {len(content)} chars")
@@ -0,0 +1,52 @@
+"""
+Test file reading and encoding detection.
+"""
+import sys
+import os
+import codecs
+import shutil
+import tempfile
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.file_utils import read_file
+
+def _read_bytes(data):
+    folder = tempfile.mkdtemp()
+    try:
+        path = os.path.join(folder, 'sample.txt')
+        with open(path, 'wb') as f:
+            f.write(data)
+        return read_file(path)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+def test_read_file_utf8():
+    print("Testing read_file UTF-8...")
+    assert _read_bytes('héllo\r\nworld\r'.encode('utf-8')) == ('héllo\nworld\n', 'utf-8')
+    assert _read_bytes(b'') == ('', 'utf-8')
+    print("UTF-8: PASS")
+
+def test_read_file_bom():
+    print("Testing read_file BOMs...")
+    assert _read_bytes(codecs.BOM_UTF8 + 'hé'.encode('utf-8')) == ('hé', 'utf-8-sig')
+    assert _read_bytes('hé\r\n'.encode('utf-16')) == ('hé\n', 'utf-16')
+    assert _read_bytes(codecs.BOM_UTF16_BE + 'hé'.encode('utf-16-be')) == ('hé', 'utf-16')
+    print("BOMs: PASS")
+
+def test_read_file_latin1_fallback():
+    print("Testing read_file Latin-1 fallback...")
+    assert _read_bytes('café'.encode('latin-1')) == ('café', 'latin-1')
+    print("Latin-1 fallback: PASS")
+
+if __name__ == '__main__':
+    try:
+        test_read_file_utf8()
+        test_read_file_bom()
+        test_read_file_latin1_fallback()
+        print("ALL TESTS PASSED")
+    except Exception as e:
+        print(f"TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
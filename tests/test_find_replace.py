@@ -0,0 +1,57 @@
+"""
+Test find query compilation.
+"""
+import sys
+import os
+import re
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from editor.text_editor import LiteralPattern
+from panels.find_replace import compile_search_pattern
+
+def test_compile_search_pattern():
+    print("Testing compile_search_pattern...")
+    # Plain case-sensitive text skips the regex engine
+    assert isinstance(compile_search_pattern('a.b', True), LiteralPattern)
+    
+    pattern = compile_search_pattern('a.b')
+    assert pattern.flags & re.IGNORECASE
+    assert pattern.search('xA.By') and not pattern.search('axb')
+    
+    pattern = compile_search_pattern('foo', True, True)
+    assert pattern.search('a foo b') and not pattern.search('food')
+    
+    pattern = compile_search_pattern('a|b', False, True, True)
+    assert pattern.fullmatch('A') and not pattern.search('ab')
+    print("compile_search_pattern: PASS")
+
+def test_compile_search_pattern_cache():
+    print("Testing compile_search_pattern caching...")
+    compile_search_pattern.cache_clear()
+    first = compile_search_pattern('needle', False, True)
+    assert compile_search_pattern('needle', False, True) is first
+    assert compile_search_pattern('needle', True, True) is not first
+    info = compile_search_pattern.cache_info()
+    assert (info.hits, info.misses) == (1, 2)
+    
+    # Invalid regexes raise and are not cached
+    try:
+        compile_search_pattern('(', use_regex=True)
+    except re.error:
+        pass
+    else:
+        raise AssertionError('expected re.error')
+    assert compile_search_pattern.cache_info().currsize == 2
+    print("compile_search_pattern cache: PASS")
+
+if __name__ == '__main__':
+    try:
+        test_compile_search_pattern()
+        test_compile_search_pattern_cache()
+        print("ALL TESTS PASSED")
+    except Exception as e:
+        print(f"TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,65 @@
+"""
+Test language detection.
+"""
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.language_detect import detect_from_extension, detect_from_shebang, detect_language
+
+def test_detect_from_extension():
+    print("Testing detect_from_extension...")
+    assert detect_from_extension('main.py') == 'python'
+    assert detect_from_extension('/src/App.TSX') == 'tsx'
+    assert detect_from_extension('C:\\work\\build.BAT') == 'batch'
+    assert detect_from_extension('archive.tar.gz') == 'text'
+    assert detect_from_extension('README') == 'text'
+    assert detect_from_extension('') == 'text'
+    assert detect_from_extension(None) == 'text'
+    
+    # Special names win over extensions; a leading dot is not an extension
+    assert detect_from_extension('/repo/Dockerfile') == 'docker'
+    assert detect_from_extension('.gitignore') == 'gitignore'
+    assert detect_from_extension('.bashrc') == 'text'
+    # Directory names don't count
+    assert detect_from_extension('/a.py/Makefile') == 'make'
+    print("detect_from_extension: PASS")
+
+def test_detect_from_shebang():
+    print("Testing detect_from_shebang...")
+    assert detect_from_shebang('#!/usr/bin/python3\nprint(1)') == 'python'
+    assert detect_from_shebang('#!/bin/sh') == 'bash'
+    assert detect_from_shebang('#! /usr/bin/node') == 'javascript'
+    assert detect_from_shebang('#!/usr/bin/env python3') == 'python'
+    assert detect_from_shebang('#!/usr/bin/env  ruby -w') == 'ruby'
+    # Options to env are skipped to reach the interpreter
+    assert detect_from_shebang('#!/usr/bin/env -S python3 -u') == 'python'
+    assert detect_from_shebang('#!/usr/bin/env -i -S perl') == 'perl'
+    # Plain env without a known interpreter
+    assert detect_from_shebang('#!/usr/bin/env') is None
+    assert detect_from_shebang('#!/usr/bin/env unknown') is None
+    
+    assert detect_from_shebang('print(1)\n#!/usr/bin/python') is None
+    assert detect_from_shebang('') is None
+    assert detect_from_shebang(None) is None
+    print("detect_from_shebang: PASS")
+
+def test_detect_language():
+    print("Testing detect_language...")
+    assert detect_language('script', '#!/bin/bash\necho hi') == 'bash'
+    assert detect_language('tool.txt', '#!/usr/bin/env python\n') == 'python'
+    assert detect_language('notes.md', 'plain') == 'markdown'
+    print("detect_language: PASS")
+
+if __name__ == '__main__':
+    try:
+        test_detect_from_extension()
+        test_detect_from_shebang()
+        test_detect_language()
+        print("ALL TESTS PASSED")
+    except Exception as e:
+        print(f"TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
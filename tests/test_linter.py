@@ -0,0 +1,57 @@
+"""
+Test linter output parsing.
+"""
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from linting.linter import Linter
+
+SEVERITY_GET = Linter.LINTERS['python']['severity_map'].get
+
+def test_parse_line_fast():
+    print("Testing _parse_line_fast...")
+    error = Linter._parse_line_fast('12:4: W0611: Unused import os\n', SEVERITY_GET)
+    assert (error.line, error.column, error.code, error.severity) == (12, 4, 'W0611', 'warning')
+    assert error.message == 'Unused import os'
+
+    # Colons in the message stay in the message
+    error = Linter._parse_line_fast('3:0: E0602: Undefined variable: x', SEVERITY_GET)
+    assert error.message == 'Undefined variable: x'
+    assert error.severity == 'error'
+
+    # Unknown prefixes fall back to info
+    assert Linter._parse_line_fast('1:0: X0001: odd', SEVERITY_GET).severity == 'info'
+    print("Fast parse: PASS")
+
+def test_parse_line_fast_rejects_other_lines():
+    print("Testing _parse_line_fast on non-result lines...")
+    for line in ('************* Module demo', '', 'a:b: W0611: msg', '1:2: W: msg',
+                 '1:2: w0611: msg', '1:2: W0611:   ', 'C:\\path\\file.py:1: W0611: msg'):
+        assert Linter._parse_line_fast(line, SEVERITY_GET) is None, line
+    print("Fast parse rejects: PASS")
+
+def test_fast_parse_matches_regex():
+    print("Testing fast parse against the pattern...")
+    config = Linter.LINTERS['python']
+    assert config['fast_parse']
+    output = ('************* Module demo\n'
+              '1:0: C0114: Missing module docstring (missing-module-docstring)\n'
+              '2:0: W0611: Unused import os (unused-import)\n')
+    fast = Linter()._parse_output(output, config)
+    slow = Linter()._parse_output(output, dict(config, fast_parse=False))
+    assert fast == slow and len(fast) == 2
+    print("Fast parse matches pattern: PASS")
+
+if __name__ == '__main__':
+    try:
+        test_parse_line_fast()
+        test_parse_line_fast_rejects_other_lines()
+        test_fast_parse_matches_regex()
+        print("ALL TESTS PASSED")
+    except Exception as e:
+        print(f"TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,74 @@
+"""
+Test settings updates and atomic file replacement.
+"""
+import sys
+import os
+import json
+import shutil
+import tempfile
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import utils.settings as settings
+from utils.settings import SettingsManager, _replace_file
+
+def _with_temp_settings(test):
+    """Run test(folder) with the settings files redirected to a temp folder."""
+    folder = tempfile.mkdtemp()
+    saved = settings.SETTINGS_FILE, settings.DRAFTS_DIR, settings._dirs_ensured
+    settings.SETTINGS_FILE = os.path.join(folder, 'settings.json')
+    settings.DRAFTS_DIR = os.path.join(folder, 'drafts')
+    settings._dirs_ensured = False
+    try:
+        test(folder)
+    finally:
+        settings.SETTINGS_FILE, settings.DRAFTS_DIR, settings._dirs_ensured = saved
+        shutil.rmtree(folder, ignore_errors=True)
+
+def test_update():
+    print("Testing SettingsManager.update...")
+    def run(folder):
+        mgr = SettingsManager()
+        saves = []
+        save = mgr.save
+        mgr.save = lambda: (saves.append(1), save())
+        
+        mgr.update({'theme': 'dark', 'word_wrap': True, 'no_such_key': 1})
+        assert len(saves) == 1
+        assert mgr.get('theme') == 'dark' and mgr.get('word_wrap') is True
+        assert not hasattr(mgr.settings, 'no_such_key')
+        
+        # Nothing changed - nothing written
+        mgr.update({'theme': 'dark', 'no_such_key': 2})
+        assert len(saves) == 1
+        
+        with open(settings.SETTINGS_FILE, 'rb') as f:
+            data = json.loads(f.read())
+        assert data['theme'] == 'dark' and 'no_such_key' not in data
+        assert SettingsManager().get('word_wrap') is True
+    _with_temp_settings(run)
+    print("update: PASS")
+
+def test_replace_file():
+    print("Testing _replace_file...")
+    def run(folder):
+        path = os.path.join(folder, 'data.json')
+        _replace_file(path, b'first')
+        _replace_file(path, b'second')
+        with open(path, 'rb') as f:
+            assert f.read() == b'second'
+        # The temp file is renamed into place, not left behind
+        assert os.listdir(folder) == ['data.json']
+    _with_temp_settings(run)
+    print("_replace_file: PASS")
+
+if __name__ == '__main__':
+    try:
+        test_update()
+        test_replace_file()
+        print("ALL TESTS PASSED")
+    except Exception as e:
+        print(f"TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
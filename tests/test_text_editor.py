@@ -0,0 +1,85 @@
+"""
+Test the text editor's search helpers (no display needed).
+"""
+import sys
+import os
+import re
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from editor.text_editor import LiteralPattern, TextEditor, _ASTRAL_EXTRA, _iter_spans, advance_index
+
+# Tk columns taken by one non-BMP character (2 on Tk 8.6, 1 on Tk 9)
+WIDE = 1 + _ASTRAL_EXTRA
+
+def test_literal_pattern():
+    print("Testing LiteralPattern...")
+    pattern = LiteralPattern('foo')
+    assert pattern.fullmatch('foo')
+    assert not pattern.fullmatch('Foo')
+    assert not pattern.fullmatch('foobar')
+    print("LiteralPattern: PASS")
+
+def test_iter_spans():
+    print("Testing _iter_spans...")
+    buf = 'foo bar foofoo'
+    assert list(_iter_spans(LiteralPattern('foo'), buf)) == [(0, 3), (8, 11), (11, 14)]
+    assert list(_iter_spans(LiteralPattern('foo'), buf, 1)) == [(8, 11), (11, 14)]
+    assert list(_iter_spans(LiteralPattern(''), buf)) == []
+    
+    # Regex and literal give the same spans; empty regex matches are skipped
+    assert list(_iter_spans(re.compile('foo'), buf)) == list(_iter_spans(LiteralPattern('foo'), buf))
+    assert list(_iter_spans(re.compile('o*'), 'xoox')) == [(1, 3)]
+    print("_iter_spans: PASS")
+
+def test_spans_to_indices():
+    print("Testing _spans_to_indices...")
+    buf = 'foo\nbar foo\n\nfoo'
+    spans = list(_iter_spans(LiteralPattern('foo'), buf))
+    assert TextEditor._spans_to_indices(buf, spans) == [
+        ('1.0', '1.3'), ('2.4', '2.7'), ('4.0', '4.3')]
+    assert TextEditor._spans_to_indices(buf, []) == []
+    
+    # A match across a newline ends on the next line
+    assert TextEditor._spans_to_indices('ab\ncd', [(1, 4)]) == [('1.1', '2.1')]
+    print("_spans_to_indices: PASS")
+
+def test_spans_to_indices_astral():
+    print("Testing _spans_to_indices past non-BMP characters...")
+    buf = '\U0001F600foo\nab\U0001F600\U0001F600foo x\n\U0001F600'
+    spans = list(_iter_spans(LiteralPattern('foo'), buf))
+    assert TextEditor._spans_to_indices(buf, spans) == [(f'1.{WIDE}', f'1.{WIDE + 3}'), (f'2.{2 + 2 * WIDE}', f'2.{5 + 2 * WIDE}')]
+    
+    # Wide characters on earlier lines don't shift later columns
+    buf = '\U0001F600\U0001F600\nfoo'
+    assert TextEditor._spans_to_indices(buf, [(3, 6)]) == [('2.0', '2.3')]
+    
+    # A match containing a wide character ends two columns further
+    buf = 'a\U0001F600b'
+    assert TextEditor._spans_to_indices(buf, [(0, 3)]) == [('1.0', f'1.{2 + WIDE}')]
+    print("_spans_to_indices astral: PASS")
+
+def test_advance_index():
+    print("Testing advance_index...")
+    assert advance_index('3.4', 5) == '3.9'
+    assert advance_index('3.4', 3, 'abc') == '3.7'
+    # Text with a newline is left for Tk to resolve
+    assert advance_index('3.4', 3, 'a\nb') == '3.4+3c'
+    # Non-BMP characters take WIDE Tk columns
+    assert advance_index('1.0', 3, 'a\U0001F600b') == f'1.{2 + WIDE}'
+    assert advance_index('1.0', 3, '\U0001F600\nb') == f'1.0+{2 + WIDE}c'
+    print("advance_index: PASS")
+
+if __name__ == '__main__':
+    try:
+        test_literal_pattern()
+        test_iter_spans()
+        test_spans_to_indices()
+        test_spans_to_indices_astral()
+        test_advance_index()
+        print("ALL TESTS PASSED")
+    except Exception as e:
+        print(f"TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
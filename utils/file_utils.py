@@ -3,8 +3,15 @@ File utilities for NP2 editor.
 Handles file operations, encoding detection, and recent files.
 """
 
+import atexit
+import codecs
+import io
+import locale
 import os
 import json
+import threading
+import time
+from collections import deque
 
 # Default encoding
 DEFAULT_ENCODING = 'utf-8'
@@ -12,34 +19,65 @@ DEFAULT_ENCODING = 'utf-8'
 # Recent files storage location
 RECENT_FILES_PATH = os.path.join(os.path.expanduser('~'), '.np2_recent.json')
 MAX_RECENT_FILES = 20
+RECENT_FILES_RECHECK = 60.0  # seconds before a recent file's existence is checked again
+RECENT_FILES_FLUSH_DELAY = 0.5  # seconds to coalesce recent-file writes
+
+# In-memory recent files list; the JSON file is written behind it
+_recent_lock = threading.Lock()
+_recent_state = {'files': None, 'mtime_ns': None, 'timer': None}
+_recent_checked = {}  # path -> monotonic time of last existence check
+
+# Terminal command history (newline-delimited)
+COMMAND_HISTORY_PATH = os.path.join(os.path.expanduser('~'), '.np2_history')
+MAX_COMMAND_HISTORY = 1000
+
+
+# Byte order marks checked before falling back to plain decoding
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
 
 
 def read_file(filepath):
     """
     Read file content with encoding detection.
     
+    The file is read once; BOMs are sniffed, then UTF-8 is tried and
+    Latin-1 (which accepts any byte) is the fallback.
+    
     Args:
         filepath: Path to file
         
     Returns:
         Tuple of (content, encoding)
     """
-    encodings = ['utf-8', 'utf-8-sig', 'latin-1', 'cp1252', 'ascii']
+    with open(filepath, 'rb') as f:
+        data = f.read()
     
-    for encoding in encodings:
+    for bom, encoding in _BOM_ENCODINGS:
+        if data.startswith(bom):
+            break
+    else:
         try:
-            with open(filepath, 'r', encoding=encoding) as f:
-                content = f.read()
-            return content, encoding
+            return _decode_text(data, 'utf-8'), 'utf-8'
         except UnicodeDecodeError:
-            continue
-        except Exception as e:
-            raise e
+            encoding = 'latin-1'
     
-    # Last resort: read as binary and decode with replacement
-    with open(filepath, 'rb') as f:
-        content = f.read().decode('utf-8', errors='replace')
-    return content, 'utf-8'
+    try:
+        return _decode_text(data, encoding), encoding
+    except UnicodeDecodeError:
+        # Last resort: decode with replacement
+        return _decode_text(data, 'utf-8', 'replace'), 'utf-8'
+
+
+def _decode_text(data, encoding, errors='strict'):
+    """Decode bytes with universal newlines, as text-mode open() would."""
+    content = data.decode(encoding, errors)
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
 
 
 def write_file(filepath, content, encoding=DEFAULT_ENCODING):
@@ -67,6 +105,20 @@ def write_file(filepath, content, encoding=DEFAULT_ENCODING):
         raise e
 
 
+def output_decoder():
+    """
+    Create an incremental decoder for raw subprocess output.
+    
+    Matches text=True (locale encoding, universal newlines) while keeping
+    characters and \r\n pairs split across reads intact.
+    
+    Returns:
+        io.IncrementalNewlineDecoder
+    """
+    encoding = locale.getpreferredencoding(False)
+    return io.IncrementalNewlineDecoder(codecs.getincrementaldecoder(encoding)('replace'), translate=True)
+
+
 def get_recent_files():
     """
     Get list of recently opened files.
@@ -74,50 +126,139 @@ def get_recent_files():
     Returns:
         List of file paths
     """
-    try:
-        if os.path.exists(RECENT_FILES_PATH):
-            with open(RECENT_FILES_PATH, 'r', encoding='utf-8') as f:
-                files = json.load(f)
-            # Filter out files that no longer exist
-            return [f for f in files if os.path.exists(f)]
-    except Exception:
-        pass
-    return []
+    with _recent_lock:
+        return _existing_recent_files(_load_recent_files())
 
 
 def add_recent_file(filepath):
     """
     Add a file to the recent files list.
     
+    The list is updated in memory immediately; the file write is deferred
+    briefly so bursts of opens and saves produce one write.
+    
     Args:
         filepath: Path to file
     """
     try:
         filepath = os.path.abspath(filepath)
-        files = get_recent_files()
-        
-        # Remove if already in list
-        if filepath in files:
-            files.remove(filepath)
-        
-        # Add to front
-        files.insert(0, filepath)
-        
-        # Limit list size
-        files = files[:MAX_RECENT_FILES]
-        
-        # Save
-        with open(RECENT_FILES_PATH, 'w', encoding='utf-8') as f:
-            json.dump(files, f)
+        with _recent_lock:
+            files = _existing_recent_files(_load_recent_files())
+            
+            # Move to front and limit list size
+            files = [filepath] + [f for f in files if f != filepath]
+            _recent_state['files'] = files[:MAX_RECENT_FILES]
+            _recent_checked[filepath] = time.monotonic()
+            
+            if _recent_state['timer'] is None:
+                timer = threading.Timer(RECENT_FILES_FLUSH_DELAY, flush_recent_files)
+                timer.daemon = True
+                _recent_state['timer'] = timer
+                timer.start()
     except Exception:
         pass
 
 
+def flush_recent_files():
+    """Write a pending recent files update to disk."""
+    with _recent_lock:
+        timer = _recent_state['timer']
+        if timer is None:
+            return
+        timer.cancel()
+        _recent_state['timer'] = None
+        try:
+            with open(RECENT_FILES_PATH, 'w', encoding='utf-8') as f:
+                json.dump(_recent_state['files'], f)
+            _recent_state['mtime_ns'] = os.stat(RECENT_FILES_PATH).st_mtime_ns
+        except Exception:
+            pass
+
+
+atexit.register(flush_recent_files)
+
+
 def clear_recent_files():
     """Clear the recent files list."""
+    with _recent_lock:
+        if _recent_state['timer'] is not None:
+            _recent_state['timer'].cancel()
+        _recent_state.update(files=[], mtime_ns=None, timer=None)
+        try:
+            if os.path.exists(RECENT_FILES_PATH):
+                os.remove(RECENT_FILES_PATH)
+        except Exception:
+            pass
+
+
+def _load_recent_files():
+    """
+    Get the stored recent files list, re-reading it only if the file changed.
+    
+    Must be called with _recent_lock held.
+    """
     try:
-        if os.path.exists(RECENT_FILES_PATH):
-            os.remove(RECENT_FILES_PATH)
+        mtime_ns = os.stat(RECENT_FILES_PATH).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    
+    files = _recent_state['files']
+    if files is not None and (_recent_state['timer'] is not None or mtime_ns == _recent_state['mtime_ns']):
+        return files
+    
+    files = []
+    if mtime_ns is not None:
+        try:
+            with open(RECENT_FILES_PATH, 'r', encoding='utf-8') as f:
+                files = json.load(f)
+        except Exception:
+            pass
+    _recent_state.update(files=files, mtime_ns=mtime_ns)
+    return files
+
+
+def _existing_recent_files(files):
+    """Filter out files that no longer exist, re-checking each at most once a minute."""
+    now = time.monotonic()
+    existing = []
+    for filepath in files:
+        checked = _recent_checked.get(filepath)
+        if checked is None or now - checked > RECENT_FILES_RECHECK:
+            if not os.path.exists(filepath):
+                _recent_checked.pop(filepath, None)
+                continue
+            _recent_checked[filepath] = now
+        existing.append(filepath)
+    return existing
+
+
+def load_command_history():
+    """
+    Load terminal command history from the previous sessions.
+    
+    Returns:
+        Bounded deque of commands, oldest first
+    """
+    history = deque(maxlen=MAX_COMMAND_HISTORY)
+    try:
+        if os.path.exists(COMMAND_HISTORY_PATH):
+            with open(COMMAND_HISTORY_PATH, 'r', encoding='utf-8') as f:
+                history.extend(line.rstrip('\n') for line in f if line.strip())
+    except Exception:
+        pass
+    return history
+
+
+def save_command_history(history):
+    """
+    Save terminal command history.
+    
+    Args:
+        history: Iterable of commands, oldest first
+    """
+    try:
+        with open(COMMAND_HISTORY_PATH, 'w', encoding='utf-8') as f:
+            f.writelines(f'{command}\n' for command in history)
     except Exception:
         pass
 
@@ -145,6 +286,10 @@ def get_file_info(filepath):
         return None
 
 
+# Bytes that may appear in text files
+_TEXT_CHARS = bytes(sorted({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100))))
+
+
 def is_binary_file(filepath, sample_size=8192):
     """
     Check if a file is binary.
@@ -164,9 +309,8 @@ def is_binary_file(filepath, sample_size=8192):
         if b'\x00' in chunk:
             return True
         
-        # Check ratio of non-text bytes
-        text_chars = bytearray({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100)))
-        non_text = len([b for b in chunk if b not in text_chars])
+        # Check ratio of non-text bytes (translate drops the text ones in C)
+        non_text = len(chunk.translate(None, _TEXT_CHARS))
         
         return non_text / len(chunk) > 0.30 if chunk else False
     except Exception:
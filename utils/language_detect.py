@@ -3,6 +3,18 @@ Language detection utilities for NP2 editor.
 Detects programming language from file extension and content.
 """
 
+import re
+from functools import lru_cache
+
+try:
+    from pygments.lexers import get_lexer_by_name
+    PYGMENTS_AVAILABLE = True
+except ImportError:
+    PYGMENTS_AVAILABLE = False
+
+# Lexer instances kept by language name
+LEXER_CACHE_SIZE = 128
+
 # Maps file extensions to Pygments lexer names
 EXTENSION_MAP = {
     # Python
@@ -101,6 +113,14 @@ EXTENSION_MAP = {
     '.R': 'r',
 }
 
+# Exact (lowercase) filenames with a fixed language
+SPECIAL_FILENAMES = {
+    'dockerfile': 'docker',
+    'makefile': 'make',
+    '.gitignore': 'gitignore',
+    '.env': 'bash',
+}
+
 # Shebang to language mapping
 SHEBANG_MAP = {
     'python': 'python',
@@ -115,6 +135,10 @@ SHEBANG_MAP = {
     'php': 'php',
 }
 
+# Interpreter name from the first line: basename of the command, or the
+# first non-option argument of /usr/bin/env
+_SHEBANG_RE = re.compile(r'[ \t]*#![ \t]*(?:\S*/)?(?:env[ \t]+(?:-\S*[ \t]+)*)?([^\s/]+)')
+
 # All supported languages for manual selection
 SUPPORTED_LANGUAGES = sorted(set(EXTENSION_MAP.values()))
 
@@ -181,21 +205,19 @@ def detect_from_extension(filename):
     if not filename:
         return 'text'
     
-    import os
-    _, ext = os.path.splitext(filename.lower())
+    # Basename without os.path; accept both separators like ntpath does
+    base = filename[max(filename.rfind('/'), filename.rfind('\\')) + 1:].lower()
     
     # Handle special filenames
-    basename = os.path.basename(filename.lower())
-    if basename == 'dockerfile':
-        return 'docker'
-    if basename == 'makefile':
-        return 'make'
-    if basename == '.gitignore':
-        return 'gitignore'
-    if basename == '.env':
-        return 'bash'
+    special = SPECIAL_FILENAMES.get(base)
+    if special:
+        return special
     
-    return EXTENSION_MAP.get(ext, 'text')
+    # Leading dots don't start an extension, as with os.path.splitext
+    dot = base.rfind('.')
+    if dot <= 0:
+        return 'text'
+    return EXTENSION_MAP.get(base[dot:], 'text')
 
 
 def detect_from_shebang(content):
@@ -211,31 +233,11 @@ def detect_from_shebang(content):
     if not content:
         return None
     
-    lines = content.split('\n')
-    if not lines:
-        return None
-    
-    first_line = lines[0].strip()
-    
-    if not first_line.startswith('#!'):
+    match = _SHEBANG_RE.match(content)
+    if not match:
         return None
     
-    # Parse shebang
-    shebang = first_line[2:].strip()
-    
-    # Handle /usr/bin/env style
-    if 'env ' in shebang:
-        parts = shebang.split()
-        if len(parts) >= 2:
-            interpreter = parts[-1]
-        else:
-            return None
-    else:
-        # Direct path like /usr/bin/python
-        import os
-        interpreter = os.path.basename(shebang.split()[0])
-    
-    return SHEBANG_MAP.get(interpreter)
+    return SHEBANG_MAP.get(match.group(1))
 
 
 def detect_language(filename, content=None):
@@ -263,14 +265,24 @@ def get_lexer_for_language(language):
     """
     Get Pygments lexer for a language.
     
+    Lexers are cached per language, so repeated lookups skip Pygments'
+    registry search.
+    
     Args:
         language: Language name
         
     Returns:
         Pygments lexer or None
     """
+    if not PYGMENTS_AVAILABLE:
+        return None
+    return _cached_lexer(language)
+
+
+@lru_cache(maxsize=LEXER_CACHE_SIZE)
+def _cached_lexer(language):
+    """Look up a lexer by name, or None if Pygments doesn't know it."""
     try:
-        from pygments.lexers import get_lexer_by_name
         return get_lexer_by_name(language)
     except Exception:
         return None
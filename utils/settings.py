@@ -5,13 +5,74 @@ Handles loading and saving of application configuration.
 
 import os
 import json
-from dataclasses import dataclass, asdict
+import sys
+from dataclasses import dataclass, fields
 from typing import Dict, Any
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 SETTINGS_FILE = os.path.join(os.path.expanduser('~'), '.np2', 'settings.json')
 DRAFTS_DIR = os.path.join(os.path.expanduser('~'), '.np2', 'drafts')
+SETTINGS_DIR = os.path.dirname(SETTINGS_FILE)
+SESSION_FILE = os.path.join(SETTINGS_DIR, 'session.json')
+
+# Set once the directories above have been created in this process
+_dirs_ensured = False
+
+def _dumps(obj, indent: bool = True) -> bytes:
+    """
+    Serialize to JSON bytes, with orjson when available.
+    
+    Args:
+        obj: Value to serialize
+        indent: Pretty-print for files users may edit; compact otherwise
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+        except TypeError:
+            # e.g. lone surrogates in buffer text; the stdlib escapes them
+            pass
+    if indent:
+        return json.dumps(obj, indent=2).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def _loads(data: bytes):
+    """Parse JSON bytes, with orjson when available."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            # orjson rejects escaped lone surrogates that the stdlib accepts
+            pass
+    return json.loads(data)
 
-@dataclass
+
+def _replace_file(path, data: bytes):
+    """
+    Write data to a temp file beside path, then swap it into place.
+    
+    A crash mid-write leaves the previous file intact instead of a
+    truncated one.
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+# __slots__ dataclasses need Python 3.10+; older versions fall back to a __dict__
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class AppSettings:
     """Application settings structure."""
     autosave_mode: str = 'off'  # 'off', 'interval', 'change'
@@ -24,37 +85,73 @@ class AppSettings:
     show_terminal: bool = True
     window_geometry: str = '1200x800'
 
+# Setting names in declaration order
+_FIELD_NAMES = tuple(f.name for f in fields(AppSettings))
+_VALID_KEYS = frozenset(_FIELD_NAMES)
+
+
+def settings_to_dict(settings: AppSettings) -> Dict[str, Any]:
+    """Copy settings into a plain dict (fields are scalars, so no deep copy)."""
+    return {name: getattr(settings, name) for name in _FIELD_NAMES}
+
+
 class SettingsManager:
     """Manages application settings and persistence."""
     
     def __init__(self):
-        self.settings = AppSettings()
-        self._ensure_dirs()
-        self.load()
+        # Loaded from disk on first access, keeping file I/O off startup
+        self._settings = None
+        self._settings_dict = None
+    
+    @property
+    def settings(self) -> AppSettings:
+        """Current settings, loaded on first access."""
+        if self._settings is None:
+            self._ensure_loaded()
+        return self._settings
+    
+    def _ensure_loaded(self):
+        """Create the settings directories and load the file, once."""
+        if self._settings is None:
+            self._settings = AppSettings()
+            self._ensure_dirs()
+            self.load()
     
     def _ensure_dirs(self):
         """Ensure settings and drafts directories exist."""
-        os.makedirs(os.path.dirname(SETTINGS_FILE), exist_ok=True)
+        global _dirs_ensured
+        if _dirs_ensured:
+            return
+        # DRAFTS_DIR lives inside SETTINGS_DIR, so this creates both
         os.makedirs(DRAFTS_DIR, exist_ok=True)
+        _dirs_ensured = True
     
     def load(self):
         """Load settings from file."""
-        if os.path.exists(SETTINGS_FILE):
-            try:
-                with open(SETTINGS_FILE, 'r') as f:
-                    data = json.load(f)
-                    # Update dataclass with loaded data, ignoring unknown keys
-                    current_dict = asdict(self.settings)
-                    current_dict.update({k: v for k, v in data.items() if k in current_dict})
-                    self.settings = AppSettings(**current_dict)
-            except Exception as e:
-                print(f"Error loading settings: {e}")
+        if self._settings is None:
+            self._settings = AppSettings()
+        # Field values as a plain dict, kept in step by set()/update() so
+        # save() can serialize it without walking the dataclass
+        self._settings_dict = settings_to_dict(self._settings)
+        try:
+            with open(SETTINGS_FILE, 'rb') as f:
+                data = _loads(f.read())
+            # Update dataclass with loaded data, ignoring unknown keys
+            current_dict = dict(self._settings_dict)
+            current_dict.update({k: data[k] for k in data.keys() & _VALID_KEYS})
+            self._settings = AppSettings(**current_dict)
+            self._settings_dict = current_dict
+        except FileNotFoundError:
+            # First run - keep the defaults
+            pass
+        except Exception as e:
+            print(f"Error loading settings: {e}")
     
     def save(self):
         """Save settings to file."""
+        self._ensure_loaded()
         try:
-            with open(SETTINGS_FILE, 'w') as f:
-                json.dump(asdict(self.settings), f, indent=4)
+            _replace_file(SETTINGS_FILE, _dumps(self._settings_dict))
         except Exception as e:
             print(f"Error saving settings: {e}")
     
@@ -63,23 +160,44 @@ class SettingsManager:
         return getattr(self.settings, key)
     
     def set(self, key: str, value: Any):
-        """Set a setting value and save."""
-        if hasattr(self.settings, key):
+        """Set a setting value and save if it changed."""
+        self._ensure_loaded()
+        if key in _VALID_KEYS and self._settings_dict[key] != value:
             setattr(self.settings, key, value)
+            self._settings_dict[key] = value
+            self.save()
+    
+    def update(self, values: Dict[str, Any]):
+        """
+        Set several setting values and save once if any changed.
+        
+        Args:
+            values: Mapping of setting name to value; unknown keys are ignored
+        """
+        self._ensure_loaded()
+        changed = False
+        for key, value in values.items():
+            if key in _VALID_KEYS and self._settings_dict[key] != value:
+                setattr(self.settings, key, value)
+                self._settings_dict[key] = value
+                changed = True
+        if changed:
             self.save()
             
     # Session Persistence Helpers
     
     def get_session_path(self):
         """Get path to session file."""
-        return os.path.join(os.path.dirname(SETTINGS_FILE), 'session.json')
+        return SESSION_FILE
     
     def save_session(self, open_files, active_index):
         """
         Save current session.
         
         Args:
-            open_files: List of dicts {'path': str, 'content': str, 'modified': bool, 'draft_id': str}
+            open_files: List of dicts {'filepath': str, 'cursor': str, 'title': str,
+                'draft_path': str, 'modified': bool}; buffer text lives in the
+                draft files, never in the session
             active_index: Index of active tab
         """
         session = {
@@ -87,18 +205,28 @@ class SettingsManager:
             'files': open_files
         }
         try:
-            with open(self.get_session_path(), 'w') as f:
-                json.dump(session, f, indent=2)
+            self._ensure_dirs()
+            _replace_file(self.get_session_path(), _dumps(session, indent=False))
         except Exception:
             pass
             
     def load_session(self):
         """Load session data."""
-        path = self.get_session_path()
-        if os.path.exists(path):
-            try:
-                with open(path, 'r') as f:
-                    return json.load(f)
-            except Exception:
-                pass
-        return None
+        try:
+            with open(self.get_session_path(), 'rb') as f:
+                return _loads(f.read())
+        except Exception:
+            # Missing (first run) or unreadable
+            return None
+
+
+# Shared manager, so every module sees one loaded copy of the settings
+_manager = None
+
+
+def get_settings_manager() -> SettingsManager:
+    """Get the process-wide SettingsManager, creating it on first use."""
+    global _manager
+    if _manager is None:
+        _manager = SettingsManager()
+    return _manager
@@ -0,0 +1,60 @@
+"""
+Timer helpers for NP2 editor.
+Coalesces bursts of Tk events into a single delayed callback.
+"""
+
+import time
+
+
+class CoalescingTimer:
+    """
+    Deadline-based debounce timer for Tk widgets.
+
+    Each call to schedule() pushes the deadline forward, but only one Tk
+    `after` callback is ever pending. When it fires early it re-arms itself
+    for the remaining time instead of being cancelled and recreated.
+    """
+
+    def __init__(self, widget, delay_ms, callback):
+        """
+        Initialize the timer.
+
+        Args:
+            widget: Any Tk widget (used for after/after_cancel)
+            delay_ms: Quiet period before the callback runs
+            callback: Function called with no arguments
+        """
+        self.widget = widget
+        self.delay_ms = delay_ms
+        self.callback = callback
+        self._deadline = 0  # monotonic ns
+        self._job = None
+
+    def schedule(self):
+        """Request the callback delay_ms after the latest call."""
+        self._deadline = time.monotonic_ns() + self.delay_ms * 1_000_000
+        if self._job is None:
+            self._job = self.widget.after(self.delay_ms, self._maybe_fire)
+
+    def cancel(self):
+        """Cancel the pending callback, if any."""
+        if self._job is not None:
+            try:
+                self.widget.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+    def is_pending(self):
+        """Return True if a callback is scheduled."""
+        return self._job is not None
+
+    def _maybe_fire(self):
+        """Run the callback if the deadline passed, otherwise re-arm for the residual."""
+        remaining_ms = (self._deadline - time.monotonic_ns()) // 1_000_000
+        if remaining_ms > 0:
+            self._job = self.widget.after(remaining_ms, self._maybe_fire)
+            return
+
+        self._job = None
+        self.callback()